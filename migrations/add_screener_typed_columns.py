@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Migration: Add typed screener columns to screener_raw
+Copies the raw_json fields read by the subnet/screener loaders into real columns so
+the hot queries no longer parse JSON per row. Works on SQLite and PostgreSQL.
+"""
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, inspect, text
+from models import ScreenerRaw, SCREENER_NUMERIC_FIELDS, SCREENER_TEXT_FIELDS, screener_columns
+from config import DB_URL
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def add_screener_typed_columns():
+    """Add the typed columns to screener_raw and backfill them from raw_json."""
+
+    # Create engine
+    engine = create_engine(DB_URL, echo=False)
+
+    try:
+        existing = {column['name'] for column in inspect(engine).get_columns('screener_raw')}
+        new_columns = [(field, 'FLOAT') for field in SCREENER_NUMERIC_FIELDS]
+        new_columns += [(field, 'VARCHAR') for field in SCREENER_TEXT_FIELDS]
+
+        with engine.connect() as conn:
+            # 1. Add the missing columns
+            for name, column_type in new_columns:
+                if name in existing:
+                    logger.info(f"✓ {name} column already exists")
+                    continue
+                logger.info(f"Adding {name} column...")
+                conn.execute(text(f"ALTER TABLE screener_raw ADD COLUMN {name} {column_type}"))
+
+            # 2. Backfill from raw_json (one row per subnet, so a Python pass is cheap)
+            logger.info("Backfilling typed columns from raw_json...")
+            rows = conn.execute(ScreenerRaw.__table__.select().with_only_columns(
+                ScreenerRaw.netuid, ScreenerRaw.raw_json)).fetchall()
+            for netuid, raw_json in rows:
+                conn.execute(
+                    ScreenerRaw.__table__.update()
+                    .where(ScreenerRaw.netuid == netuid)
+                    .values(**screener_columns(raw_json or {}))
+                )
+
+            # Commit the changes
+            conn.commit()
+            logger.info(f"✅ Typed screener columns ready ({len(rows)} rows backfilled)")
+
+    except Exception as e:
+        logger.error(f"❌ Error adding typed screener columns: {e}")
+        raise
+    finally:
+        engine.dispose()
+
+if __name__ == "__main__":
+    add_screener_typed_columns()
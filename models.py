@@ -18,6 +18,46 @@ class ScreenerRaw(Base):
     fetched_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
+    # — typed copies of the raw_json fields read by the app, written at fetch time —
+    price_tao = Column(Float)
+    market_cap_tao = Column(Float)
+    fdv_tao = Column(Float)
+    total_stake_tao = Column(Float)
+    tao_in = Column(Float)
+    buy_volume_tao_1d = Column(Float)
+    net_volume_tao_24h = Column(Float)
+    net_volume_tao_7d = Column(Float)
+    github_repo = Column(String)
+    subnet_url = Column(String)
+
+# raw_json keys mirrored into ScreenerRaw columns of the same name
+SCREENER_NUMERIC_FIELDS = (
+    'price_tao', 'market_cap_tao', 'fdv_tao', 'total_stake_tao', 'tao_in',
+    'buy_volume_tao_1d', 'net_volume_tao_24h', 'net_volume_tao_7d',
+)
+SCREENER_TEXT_FIELDS = ('github_repo', 'subnet_url')
+
+def screener_columns(row):
+    """
+    Extract the typed ScreenerRaw column values from one screener API row.
+    
+    Args:
+        row: Screener row as returned by the TAO.app API (stored as raw_json)
+        
+    Returns:
+        Dict of column name to value; unparseable numbers become None
+    """
+    columns = {}
+    for field in SCREENER_NUMERIC_FIELDS:
+        try:
+            columns[field] = float(row.get(field))
+        except (TypeError, ValueError):
+            columns[field] = None
+    for field in SCREENER_TEXT_FIELDS:
+        value = row.get(field)
+        columns[field] = str(value) if value is not None else None
+    return columns
+
 class SubnetMeta(Base):
     __tablename__ = "subnet_meta"
     netuid = Column(Integer, primary_key=True)
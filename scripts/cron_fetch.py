@@ -21,7 +21,7 @@ sys.path.insert(0, str(project_root))
 from services.quota_guard import QuotaGuard, QuotaExceededError
 from scripts.data_collection.fetch_screener import main as fetch_subnet_screener
 from scripts.data_collection.fetch_coingecko_data import main as fetch_coingecko_data
-from services.db import get_db
+from services.db import get_db, optimize_database
 from services.db_utils import get_database_type
 from services.bittensor.metrics import calculate_subnet_metrics
 from services.bittensor.async_metrics import collect_all_subnet_metrics_async, collect_all_subnet_metrics_sync
@@ -997,18 +997,29 @@ class CronFetch:
         logger.info(f"Running {collection_type} collection once...")
         
         if collection_type == 'nightly':
-            return self.nightly_collection()
+            result = self.nightly_collection()
         elif collection_type == 'hourly':
-            return self.hourly_collection()
+            result = self.hourly_collection()
         elif collection_type == 'subnet':
-            return self.fetch_subnet_data()
+            result = self.fetch_subnet_data()
         elif collection_type == 'coingecko':
-            return self.fetch_coingecko_data()
+            result = self.fetch_coingecko_data()
         elif collection_type == 'sdk_snapshot':
-            return self.fetch_sdk_snapshot()
+            result = self.fetch_sdk_snapshot()
         else:
             logger.error(f"Unknown collection type: {collection_type}")
             return False
+        
+        # Refresh planner statistics after the bulk writes
+        self.optimize_database()
+        return result
+    
+    def optimize_database(self):
+        """Refresh SQLite planner statistics; a failure here never fails a collection."""
+        try:
+            optimize_database()
+        except Exception as e:
+            logger.error(f"Error optimizing database: {e}")
     
     def start_scheduler(self):
         """Start the scheduled collection."""
@@ -1022,6 +1033,9 @@ class CronFetch:
         schedule.every().hour.do(self.hourly_collection)
         logger.info("Scheduled hourly collection every hour")
         
+        # Keep SQLite planner statistics fresh (no-op on PostgreSQL)
+        schedule.every().hour.do(self.optimize_database)
+        
         # Run initial collection
         logger.info("Running initial collection...")
         self.nightly_collection()
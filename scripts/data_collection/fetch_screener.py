@@ -8,7 +8,7 @@ from datetime import datetime
 # Add the parent directory to Python path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config import TAO_ENDPOINT, TAO_KEY
-from models import ScreenerRaw, SubnetMeta
+from models import ScreenerRaw, SubnetMeta, screener_columns
 from services.db import get_db
 from services.cache import clear_all_caches
 
@@ -28,7 +28,8 @@ def main():
         screener_raw = ScreenerRaw(
             netuid=netuid,
             raw_json=row,
-            fetched_at=current_time
+            fetched_at=current_time,
+            **screener_columns(row)
         )
         sess.merge(screener_raw)
 
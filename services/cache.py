@@ -97,6 +97,7 @@ class LRUCache:
 # Global cache instances
 api_cache = LRUCache(max_size=200, ttl=3600)  # 1 hour TTL for API responses
 db_cache = LRUCache(max_size=100, ttl=1800)   # 30 min TTL for DB queries
+frame_cache = LRUCache(max_size=64, ttl=600)  # Subnet/screener frames, keyed on data version
 
 
 def cached(cache_instance: LRUCache = None):
@@ -140,6 +141,11 @@ def cache_stats() -> Dict[str, Any]:
             'size': db_cache.size(),
             'max_size': db_cache.max_size,
             'ttl': db_cache.ttl
+        },
+        'frame_cache': {
+            'size': frame_cache.size(),
+            'max_size': frame_cache.max_size,
+            'ttl': frame_cache.ttl
         }
     }
 
@@ -148,11 +154,13 @@ def clear_all_caches() -> None:
     """Clear all cache instances."""
     api_cache.clear()
     db_cache.clear()
+    frame_cache.clear()
 
 
 def cleanup_all_caches() -> Dict[str, int]:
     """Clean up expired items from all caches."""
     return {
         'api_cache_expired': api_cache.cleanup_expired(),
-        'db_cache_expired': db_cache.cleanup_expired()
+        'db_cache_expired': db_cache.cleanup_expired(),
+        'frame_cache_expired': frame_cache.cleanup_expired()
     } 
\ No newline at end of file
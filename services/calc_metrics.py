@@ -6,6 +6,7 @@ Implements the exact formulas specified in the feedback.
 import numpy as np
 import logging
 import os
+from math import sqrt as _msqrt
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple, Union
 
@@ -105,39 +106,40 @@ def calculate_consensus_alignment(consensus: np.ndarray, stakes: np.ndarray) ->
     Returns:
         Consensus alignment percentage (0-100)
     """
-    if consensus is None or stakes is None or len(consensus) == 0 or len(stakes) == 0:
+    if consensus is None or stakes is None or len(consensus) == 0 or len(consensus) != len(stakes):
         return None
     
-    try:
-        # Convert to numpy arrays if needed
-        consensus = np.array(consensus)
-        stakes = np.array(stakes)
-        
-        # Calculate stake-weighted mean
-        mean = np.average(consensus, weights=stakes)
-        
-        # Calculate stake-weighted standard deviation
-        variance = np.average((consensus - mean) ** 2, weights=stakes)
-        sigma = np.sqrt(variance)
-        
-        # Find UIDs within ±2σ
-        aligned = np.abs(consensus - mean) < 2 * sigma
-        
-        # Calculate stake-weighted percentage
-        consensus_alignment = np.average(aligned, weights=stakes) * 100
-        
-        return float(consensus_alignment)
-        
-    except Exception as e:
-        logger.error(f"Error calculating consensus alignment: {e}")
+    # Convert to float32 arrays (output is rendered to 1 decimal, f32 is plenty)
+    consensus = np.asarray(consensus, dtype=np.float32)
+    stakes = np.asarray(stakes, dtype=np.float32)
+    
+    # Weighted means divide by the total stake
+    total_stake = stakes.sum(dtype=np.float64)
+    if total_stake <= 0:
         return None
+    
+    # Calculate stake-weighted mean (accumulated in f64)
+    mean = (consensus * stakes).sum(dtype=np.float64) / total_stake
+    
+    # Calculate stake-weighted standard deviation from centered deviations, so
+    # whale-dominated subnets don't lose precision to Sxx/Sw - mean² cancellation
+    deviation = np.abs(consensus - mean)
+    variance = (deviation ** 2 * stakes).sum(dtype=np.float64) / total_stake
+    sigma = _msqrt(variance)
+    
+    # Find UIDs within ±2σ
+    aligned = deviation < 2 * sigma
+    
+    # Calculate stake-weighted percentage
+    consensus_alignment = stakes[aligned].sum(dtype=np.float64) / total_stake * 100
+    
+    return float(consensus_alignment)
 
 def calculate_trust_score(trust: np.ndarray, stakes: np.ndarray) -> Optional[float]:
     """
     Calculate stake-weighted trust score.
     
-    Formula: weights = stakes / stakes.sum()
-             trust_score = (trust * weights).sum()
+    Formula: trust_score = np.dot(trust, stakes) / stakes.sum()
     
     Args:
         trust: Trust values array
@@ -146,31 +148,23 @@ def calculate_trust_score(trust: np.ndarray, stakes: np.ndarray) -> Optional[flo
     Returns:
         Stake-weighted trust score (0-1)
     """
-    if trust is None or stakes is None or len(trust) == 0 or len(stakes) == 0:
+    if trust is None or stakes is None or len(trust) == 0 or len(trust) != len(stakes):
         return None
     
-    try:
-        # Convert to numpy arrays if needed
-        trust = np.array(trust)
-        stakes = np.array(stakes)
-        
-        # Calculate total stake
-        total_stake = stakes.sum()
-        
-        if total_stake <= 0:
-            return None
-        
-        # Calculate stake weights
-        weights = stakes / total_stake
-        
-        # Calculate stake-weighted trust score
-        trust_score = (trust * weights).sum()
-        
-        return float(trust_score)
-        
-    except Exception as e:
-        logger.error(f"Error calculating trust score: {e}")
+    # Convert to float32 arrays (output is rendered to 1 decimal, f32 is plenty)
+    trust = np.asarray(trust, dtype=np.float32)
+    stakes = np.asarray(stakes, dtype=np.float32)
+    
+    # Calculate total stake (accumulated in f64 so large stakes keep precision)
+    total_stake = stakes.sum(dtype=np.float64)
+    
+    if total_stake <= 0:
         return None
+    
+    # Stake-weighted trust score as a single dot product (no weights array), accumulated in f64
+    trust_score = np.dot(trust.astype(np.float64), stakes) / total_stake
+    
+    return float(trust_score)
 
 def calculate_tao_score(
     stake_quality: Optional[float],
@@ -292,33 +286,33 @@ def calculate_stake_hhi(stakes: np.ndarray) -> Optional[float]:
     if stakes is None or len(stakes) == 0:
         return None
     
-    try:
-        # Convert to numpy array if needed
-        stakes = np.array(stakes)
-        
-        # Calculate total stake
-        total_stake = stakes.sum()
-        
-        if total_stake <= 0:
-            return None
-        
-        # Calculate market shares
-        market_shares = stakes / total_stake
-        
-        # Calculate HHI
-        hhi = (market_shares ** 2).sum() * 10000
-        
-        return float(hhi)
-        
-    except Exception as e:
-        logger.error(f"Error calculating stake HHI: {e}")
+    # Convert to float32 array (output is rendered to 1 decimal, f32 is plenty)
+    stakes = np.asarray(stakes, dtype=np.float32)
+    
+    # Calculate total stake (accumulated in f64 so large stakes keep precision)
+    total_stake = stakes.sum(dtype=np.float64)
+    
+    if total_stake <= 0:
         return None
+    
+    # Calculate market shares
+    market_shares = stakes / total_stake
+    
+    # Calculate HHI
+    hhi = (market_shares ** 2).sum() * 10000
+    
+    return float(hhi)
 
 def calculate_rank_percentage(value: float, category_values: list) -> Optional[int]:
     """
     Calculate rank percentage within a category.
     
-    Formula: rank_pct = round((position / total_count) * 100)
+    Formula: position = count(values < value)
+             rank_pct = round((position / total_count) * 100)
+    
+    The position is found by counting smaller values (O(N)) rather than
+    sorting the category. A value missing from the category is ranked where it
+    would fall instead of returning None.
     
     Args:
         value: The value to rank
@@ -330,33 +324,27 @@ def calculate_rank_percentage(value: float, category_values: list) -> Optional[i
     if value is None or category_values is None or len(category_values) == 0:
         return None
     
-    try:
-        # Filter out None values
-        valid_values = [v for v in category_values if v is not None]
-        
-        if len(valid_values) == 0:
-            return None
-        
-        # Sort values (ascending for stake_quality, descending for momentum)
-        sorted_values = sorted(valid_values)
-        
-        # Find position (0-indexed)
-        position = sorted_values.index(value)
-        
-        # Calculate percentage
-        rank_pct = round((position / len(sorted_values)) * 100)
-        
-        return rank_pct
-        
-    except Exception as e:
-        logger.error(f"Error calculating rank percentage: {e}")
+    # Filter out None values
+    valid_values = np.asarray([v for v in category_values if v is not None], dtype=np.float64)
+    
+    if valid_values.size == 0:
         return None
+    
+    # Position (0-indexed) = number of values ranked below this one
+    position = np.count_nonzero(valid_values < value)
+    
+    # Calculate percentage
+    rank_pct = round((position / valid_values.size) * 100)
+    
+    return rank_pct
 
 def calculate_validator_utilization(active_validators: int, total_possible: int = 256) -> Optional[int]:
     """
     Calculate validator utilization percentage.
     
-    Formula: util_pct = round((active_validators / total_possible) * 100)
+    Formula: util_pct = round(active_validators * 100 / total_possible)
+    
+    Evaluated with integer divmod; exact halves round to even, as round() does.
     
     Args:
         active_validators: Number of active validators
@@ -365,16 +353,13 @@ def calculate_validator_utilization(active_validators: int, total_possible: int
     Returns:
         Utilization percentage (0-100)
     """
-    if active_validators is None or active_validators < 0:
+    if active_validators is None or active_validators < 0 or total_possible <= 0:
         return None
     
-    try:
-        util_pct = round((active_validators / total_possible) * 100)
-        return min(util_pct, 100)  # Cap at 100%
-        
-    except Exception as e:
-        logger.error(f"Error calculating validator utilization: {e}")
-        return None
+    util_pct, remainder = divmod(active_validators * 100, total_possible)
+    if 2 * remainder > total_possible or (2 * remainder == total_possible and util_pct % 2):
+        util_pct += 1
+    return 100 if util_pct > 100 else int(util_pct)  # Cap at 100%
 
 def calculate_active_stake_ratio(stakes: np.ndarray, validator_permit: np.ndarray) -> Optional[float]:
     """
@@ -392,19 +377,21 @@ def calculate_active_stake_ratio(stakes: np.ndarray, validator_permit: np.ndarra
     if stakes is None or validator_permit is None:
         return None
     
-    try:
-        total_stake = stakes.sum()
-        if total_stake == 0:
-            return 0.0
-        
-        active_stake = stakes[validator_permit].sum()
-        ratio = (active_stake / total_stake) * 100
-        
-        return round(ratio, 1)
-        
-    except Exception as e:
-        logger.error(f"Error calculating active stake ratio: {e}")
+    # Convert to float32 array (output is rendered to 1 decimal, f32 is plenty)
+    stakes = np.asarray(stakes, dtype=np.float32)
+    validator_permit = np.asarray(validator_permit, dtype=bool)
+    if stakes.shape != validator_permit.shape:
         return None
+    
+    # Totals accumulated in f64 so large stakes keep precision
+    total_stake = stakes.sum(dtype=np.float64)
+    if total_stake == 0:
+        return 0.0
+    
+    active_stake = stakes[validator_permit].sum(dtype=np.float64)
+    ratio = float(active_stake / total_stake) * 100
+    
+    return round(ratio, 1)
 
 def calculate_buy_sell_ratio(buy_volume: float, sell_volume: float) -> Optional[float]:
     """
@@ -422,16 +409,11 @@ def calculate_buy_sell_ratio(buy_volume: float, sell_volume: float) -> Optional[
     if buy_volume is None or sell_volume is None:
         return None
     
-    try:
-        # Avoid division by zero
-        denominator = max(1, sell_volume)
-        ratio = buy_volume / denominator
-        
-        return round(ratio, 2)
-        
-    except Exception as e:
-        logger.error(f"Error calculating buy/sell ratio: {e}")
-        return None
+    # Avoid division by zero
+    denominator = max(1, sell_volume)
+    ratio = buy_volume / denominator
+    
+    return round(ratio, 2)
 
 def validate_metrics(metrics: Dict[str, Any]) -> Tuple[bool, str]:
     """
@@ -533,34 +515,50 @@ def calculate_all_metrics(
     """
     results = {}
     
-    # Calculate stake metrics
-    if stakes is not None:
-        results['stake_hhi'] = calculate_stake_hhi(stakes)
-        results['stake_quality'] = calculate_stake_quality(results['stake_hhi'])
-    
-    # Calculate emission metrics
-    if daily_emission_tao is not None and total_stake_tao is not None:
-        results['emission_roi'] = calculate_emission_roi(daily_emission_tao, total_stake_tao)
-    
-    # Calculate reserve momentum
-    if tao_in is not None and tao_in_yesterday is not None and market_cap_tao is not None:
-        results['reserve_momentum'] = calculate_reserve_momentum(tao_in, tao_in_yesterday, market_cap_tao)
-    
-    # Calculate consensus alignment
-    if consensus is not None and stakes is not None:
-        results['consensus_alignment'] = calculate_consensus_alignment(consensus, stakes)
-    
-    # Calculate trust score
-    if trust is not None and stakes is not None:
-        results['trust_score'] = calculate_trust_score(trust, stakes)
-    
-    # Calculate active stake ratio
-    if stakes is not None and validator_permit is not None:
-        results['active_stake_ratio'] = calculate_active_stake_ratio(stakes, validator_permit)
+    # Helpers validate their own inputs; this guard only keeps a malformed
+    # SDK payload from dropping the raw screener values below
+    try:
+        # Convert SDK arrays once; the helpers' np.asarray calls are then no-copy
+        if stakes is not None:
+            stakes = np.asarray(stakes, dtype=np.float32)
+        if consensus is not None:
+            consensus = np.asarray(consensus, dtype=np.float32)
+        if trust is not None:
+            trust = np.asarray(trust, dtype=np.float32)
+        if validator_permit is not None:
+            validator_permit = np.asarray(validator_permit, dtype=bool)
+        
+        # Calculate stake metrics
+        if stakes is not None:
+            results['stake_hhi'] = calculate_stake_hhi(stakes)
+            results['stake_quality'] = calculate_stake_quality(results['stake_hhi'])
+        
+        # Calculate emission metrics
+        if daily_emission_tao is not None and total_stake_tao is not None:
+            results['emission_roi'] = calculate_emission_roi(daily_emission_tao, total_stake_tao)
+        
+        # Calculate reserve momentum
+        if tao_in is not None and tao_in_yesterday is not None and market_cap_tao is not None:
+            results['reserve_momentum'] = calculate_reserve_momentum(tao_in, tao_in_yesterday, market_cap_tao)
+        
+        # Calculate consensus alignment
+        if consensus is not None and stakes is not None:
+            results['consensus_alignment'] = calculate_consensus_alignment(consensus, stakes)
+        
+        # Calculate trust score
+        if trust is not None and stakes is not None:
+            results['trust_score'] = calculate_trust_score(trust, stakes)
+        
+        # Calculate active stake ratio
+        if stakes is not None and validator_permit is not None:
+            results['active_stake_ratio'] = calculate_active_stake_ratio(stakes, validator_permit)
+        
+        # Calculate active validators
+        if validator_permit is not None:
+            results['validators_active'] = int(np.count_nonzero(validator_permit))
     
-    # Calculate active validators
-    if validator_permit is not None:
-        results['validators_active'] = int(validator_permit.sum()) if hasattr(validator_permit, 'sum') else len([v for v in validator_permit if v])
+    except Exception as e:
+        logger.error(f"Error calculating derived metrics: {e}")
     
     # Store raw values
     results.update({
@@ -612,6 +610,21 @@ def calculate_all_metrics(
     
     return results 
 
+def _sqrt_transform(x):
+    """Gentler transformation for heavy-tailed metrics (TAO-Score v2.1)."""
+    if x is None or x <= 0:
+        return 0
+    return _msqrt(abs(x))
+
+def _normalized_z_score(x, mean=0, std=1, min_val=-3, max_val=3):
+    """Z-score clipped to [min_val, max_val] and scaled to 0-100 (TAO-Score v2.1)."""
+    if x is None:
+        return 0
+    z = (x - mean) / std if std > 0 else 0
+    # Clip to reasonable range and scale to 0-100
+    z_clipped = max(min_val, min(max_val, z))
+    return (z_clipped - min_val) / (max_val - min_val) * 100
+
 def calculate_tao_score_v21(
     # Core metrics
     stake_quality: Optional[float],
@@ -696,38 +709,13 @@ def calculate_tao_score_v21(
             sharpe_30d = price_30d_change / 100  # Normalize to reasonable range
         
         # Apply expert-recommended scaling and normalization
-        
-        # Heavy-tailed metrics: log(1 + x) transformation
-        def log_transform(x):
-            if x is None or x <= 0:
-                return 0
-            return np.log(1 + abs(x))
-        
-        # Z-score normalization (simplified for now)
-        def z_score(x, mean=0, std=1):
-            if x is None:
-                return 0
-            return (x - mean) / std if std > 0 else 0
+        sqrt_transform = _sqrt_transform
+        normalized_z_score = _normalized_z_score
         
         # Apply gentler transformations for better scaling
         sq = max(0, min(100, stake_quality or 0))  # Already 0-100
         av = max(0, min(100, (active_validators or 0) / 256 * 100))  # Scale 0-256 to 0-100
         
-        # Gentler transformations for heavy-tailed metrics
-        def sqrt_transform(x):
-            if x is None or x <= 0:
-                return 0
-            return np.sqrt(abs(x))
-        
-        # Normalized z-scores with reasonable ranges
-        def normalized_z_score(x, mean=0, std=1, min_val=-3, max_val=3):
-            if x is None:
-                return 0
-            z = (x - mean) / std if std > 0 else 0
-            # Clip to reasonable range and scale to 0-100
-            z_clipped = max(min_val, min(max_val, z))
-            return (z_clipped - min_val) / (max_val - min_val) * 100
-        
         # Apply improved transformations
         hhi = normalized_z_score(stake_hhi or 0, mean=5000, std=2000)  # HHI to 0-100
         mcap = sqrt_transform(market_cap_tao or 0)  # Square root for heavy-tailed data
@@ -802,55 +790,64 @@ def calculate_tao_scores_comparison(
     price_tao: Optional[float] = None,
     root_prop_prev: Optional[float] = None,
     
-    session = None
+    session = None,
+    which: str = 'both'
 ) -> Dict[str, Optional[float]]:
     """
-    Calculate both TAO Score v1.1 and v2.1 for comparison.
+    Calculate TAO Score v1.1 and/or v2.1 for comparison.
+    
+    Args:
+        which: 'both', 'v11' or 'v21'; callers rendering a single version
+            skip computing the other one
     
     Returns:
-        Dictionary with 'tao_score_v11' and 'tao_score_v21' scores
+        Dictionary with 'tao_score_v11' and/or 'tao_score_v21' scores
     """
+    if which not in ('both', 'v11', 'v21'):
+        raise ValueError(f"which must be 'both', 'v11' or 'v21', got {which!r}")
+    
+    result = {}
     try:
         # Calculate v1.1 score
-        tao_score_v11 = calculate_tao_score(
-            stake_quality=stake_quality,
-            consensus_alignment=consensus_alignment,
-            active_stake_ratio=active_stake_ratio,
-            emission_roi=None,  # Not used in v1.1
-            reserve_momentum=None,  # Not used in v1.1
-            validator_util_pct=validator_util_pct,
-            inflation_pct=None,  # Not used in v1.1
-            price_7d_change=price_7d_change,
-            session=session
-        )
+        if which in ('both', 'v11'):
+            result['tao_score_v11'] = calculate_tao_score(
+                stake_quality=stake_quality,
+                consensus_alignment=consensus_alignment,
+                active_stake_ratio=active_stake_ratio,
+                emission_roi=None,  # Not used in v1.1
+                reserve_momentum=None,  # Not used in v1.1
+                validator_util_pct=validator_util_pct,
+                inflation_pct=None,  # Not used in v1.1
+                price_7d_change=price_7d_change,
+                session=session
+            )
         
         # Calculate v2.1 score
-        tao_score_v21 = calculate_tao_score_v21(
-            stake_quality=stake_quality,
-            active_validators=active_validators,
-            stake_hhi=stake_hhi,
-            market_cap_tao=market_cap_tao,
-            emission_pct=emission_pct,
-            flow_24h=flow_24h,
-            root_prop=root_prop,
-            price_30d_change=price_30d_change,
-            total_volume_tao_1d=total_volume_tao_1d,
-            fdv_tao=fdv_tao,
-            total_emission_tao=total_emission_tao,
-            alpha_circ=alpha_circ,
-            price_tao=price_tao,
-            root_prop_prev=root_prop_prev,
-            session=session
-        )
-        
-        return {
-            'tao_score_v11': tao_score_v11,
-            'tao_score_v21': tao_score_v21
-        }
+        if which in ('both', 'v21'):
+            result['tao_score_v21'] = calculate_tao_score_v21(
+                stake_quality=stake_quality,
+                active_validators=active_validators,
+                stake_hhi=stake_hhi,
+                market_cap_tao=market_cap_tao,
+                emission_pct=emission_pct,
+                flow_24h=flow_24h,
+                root_prop=root_prop,
+                price_30d_change=price_30d_change,
+                total_volume_tao_1d=total_volume_tao_1d,
+                fdv_tao=fdv_tao,
+                total_emission_tao=total_emission_tao,
+                alpha_circ=alpha_circ,
+                price_tao=price_tao,
+                root_prop_prev=root_prop_prev,
+                session=session
+            )
+        
+        return result
         
     except Exception as e:
         logger.error(f"Error calculating TAO scores comparison: {e}")
-        return {
-            'tao_score_v11': None,
-            'tao_score_v21': None
-        } 
\ No newline at end of file
+        if which in ('both', 'v11'):
+            result['tao_score_v11'] = None
+        if which in ('both', 'v21'):
+            result['tao_score_v21'] = None
+        return result 
\ No newline at end of file
@@ -5,11 +5,14 @@ Focuses purely on statistical correlation analysis between metrics.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import copy
+import functools
 import logging
-from scipy import stats
-from services.db import get_db
+from scipy import special
+from sqlalchemy import text
+from services.db import get_db, read_query_frame
 from models import MetricsSnap
 
 logger = logging.getLogger(__name__)
@@ -18,18 +21,148 @@ logger = logging.getLogger(__name__)
 MIN_CORRELATION = 0.3
 MAX_P_VALUE = 0.05
 Z_SCORE_THRESHOLD = 2.0
+MIN_ANALYSIS_ROWS = 10  # Fewer snapshots than this can't give meaningful correlations
+
+# Metrics considered for correlation analysis, grouped by category
+CORR_COLUMNS = [
+    # Core metrics
+    'tao_score', 'stake_quality', 'buy_signal', 'emission_roi', 'trust_score',
+    # Market & Price metrics
+    'market_cap_tao', 'fdv_tao', 'price_tao', 'price_1d_change', 'price_7d_change',
+    'price_30d_change', 'price_1h_change', 'flow_24h', 'ath_60d', 'atl_60d',
+    # Volume & Trading metrics
+    'buy_volume_tao_1d', 'sell_volume_tao_1d', 'total_volume_tao_1d',
+    'buy_vol_tao_1d', 'sell_vol_tao_1d', 'buy_sell_ratio',
+    'net_volume_tao_1h', 'net_volume_tao_7d', 'total_volume_pct_change',
+    # Network & Validator metrics
+    'active_validators', 'validators_active', 'validator_util_pct',
+    'total_stake_tao', 'max_validators', 'uid_count', 'active_stake_ratio',
+    # Stake distribution metrics
+    'stake_hhi', 'gini_coeff_top_100', 'hhi', 'stake_quality_rank_pct',
+    # Token flow & Emission metrics
+    'reserve_momentum', 'tao_in', 'alpha_circ', 'alpha_prop', 'root_prop',
+    'alpha_in', 'alpha_out', 'emission_pct', 'alpha_emitted_pct',
+    # Consensus & Incentive metrics
+    'consensus_alignment', 'mean_consensus', 'pct_aligned', 'confidence',
+    'mean_incentive', 'p95_incentive',
+    # Emission & PnL metrics
+    'emission_owner', 'emission_miners', 'emission_validators',
+    'total_emission_tao', 'tao_in_emission', 'alpha_out_emission',
+    'realized_pnl_tao', 'unrealized_pnl_tao',
+    # Performance & Momentum metrics
+    'momentum_rank_pct'
+]
+
+# Identifying columns loaded alongside the metrics
+ID_COLUMNS = ['netuid', 'subnet_name', 'category', 'timestamp']
+
+# Metrics screened for outliers and reported in the summary statistics
+OUTLIER_METRICS = ('tao_score', 'stake_quality', 'market_cap_tao', 'total_stake_tao', 'active_validators')
+SUMMARY_METRICS = ('tao_score', 'stake_quality', 'market_cap_tao', 'total_stake_tao')
+
+def _select_list() -> str:
+    """Render the SELECT column list for the analysis queries."""
+    return ', '.join(ID_COLUMNS + CORR_COLUMNS)
+
+def _pairwise_pearson(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation over pairwise-complete observations, like DataFrame.corr().
+    
+    NaNs are masked out per pair, and all sums come from a handful of matrix
+    products instead of one Python-level computation per column pair.
+    
+    Args:
+        values: 2-D array (rows x metrics) with NaN for missing values
+        
+    Returns:
+        Tuple of (correlation matrix, pairwise sample sizes)
+    """
+    mask = ~np.isnan(values)
+    present = mask.astype(np.float64)
+    counts = present.sum(axis=0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Center each column on its own mean first; Pearson is shift-invariant and
+        # this keeps the sums below well conditioned for large metrics (market cap)
+        col_means = np.where(counts > 0, np.where(mask, values, 0.0).sum(axis=0) / counts, 0.0)
+        centered = np.where(mask, values - col_means, 0.0)
+        
+        # [i, j] entries are sums over rows where both metric i and metric j are present;
+        # 0/1 counts are exact in float32 (up to 2**24 rows), halving that matmul's traffic
+        present32 = mask.astype(np.float32)
+        n = (present32.T @ present32).astype(np.float64)
+        sum_x = centered.T @ present
+        sum_xx = (centered * centered).T @ present
+        sum_xy = centered.T @ centered
+        
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_x = sum_xx - sum_x * sum_x / n
+        
+        # A constant pair subset leaves only rounding noise in the variance
+        var_x[var_x <= 1e-12 * sum_xx] = np.nan
+        var_y = var_x.T
+        r = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+    
+    diagonal = np.diagonal(r).copy()
+    diagonal[~np.isnan(diagonal)] = 1.0
+    np.fill_diagonal(r, diagonal)
+    
+    return r, n
+
+def _window_filter(days_back: int, selected_subnet: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the WHERE clause and bind parameters for the analysis window.
+    
+    Snapshots are stored as naive UTC, so the cutoff is computed in Python and bound
+    the same way on SQLite and PostgreSQL.
+    
+    Args:
+        days_back: Number of days of data to analyze
+        selected_subnet: Specific subnet to analyze, or None/"all" for network-wide
+        
+    Returns:
+        Tuple of (WHERE clause, bind parameters)
+    """
+    where = "timestamp >= :cutoff_date"
+    params = {'cutoff_date': datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days_back)}
+    
+    if selected_subnet and selected_subnet != "all":
+        where += " AND netuid = :netuid"
+        params['netuid'] = int(selected_subnet)
+    
+    return where, params
+
+def _numeric_metrics(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Select metric columns, coercing any that arrived as object dtype to numbers (NaN if invalid)."""
+    metrics = df[columns]
+    non_numeric = metrics.select_dtypes(exclude='number').columns
+    if len(non_numeric) > 0:
+        metrics = metrics.assign(**{col: pd.to_numeric(metrics[col], errors='coerce') for col in non_numeric})
+    return metrics
 
 class CorrelationAnalysisService:
     """Service for clean statistical correlation analysis."""
     
     def __init__(self):
         """Initialize the correlation analysis service."""
-        pass
+        # Results are deterministic per window contents, so cache them by latest timestamp and row count
+        self._cached_analysis = functools.lru_cache(maxsize=32)(self._compute_correlation_analysis)
+    
+    def clear_cache(self) -> bool:
+        """Drop all cached correlation analysis results."""
+        self._cached_analysis.cache_clear()
+        logger.info("Correlation analysis cache cleared")
+        return True
     
     def get_correlation_analysis(self, days_back: int = 2, selected_subnet: Optional[str] = None) -> Dict[str, Any]:
         """
         Get clean correlation analysis for metrics.
         
+        Results are cached per (days_back, selected_subnet, latest snapshot timestamp,
+        row count), so repeated dashboard polls between data collections skip the
+        analysis while rows ageing out of the window still trigger a recompute. The same
+        probe short-circuits windows with too few snapshots to correlate.
+        
         Args:
             days_back: Number of days of data to analyze
             selected_subnet: Specific subnet to analyze, or None for network-wide
@@ -38,33 +171,22 @@ class CorrelationAnalysisService:
             Dictionary with correlation analysis results
         """
         try:
-            # Get data
-            df = self._get_analysis_data(days_back, selected_subnet)
-            if df.empty:
+            if selected_subnet == "all":
+                selected_subnet = None
+            
+            latest_timestamp, row_count = self._probe_snapshot(days_back, selected_subnet)
+            if row_count < MIN_ANALYSIS_ROWS:
                 return {
                     'success': False,
-                    'error': 'No data available for analysis',
+                    'error': f'Not enough data for analysis ({row_count} snapshots in the last {days_back} days)',
                     'correlation_matrix': None,
                     'significant_correlations': [],
                     'outliers': [],
                     'summary_stats': {}
                 }
             
-            # Calculate correlations
-            correlation_matrix = self._calculate_correlation_matrix(df)
-            significant_correlations = self._find_significant_correlations(df)
-            outliers = self._detect_outliers(df)
-            summary_stats = self._calculate_summary_stats(df)
-            
-            return {
-                'success': True,
-                'correlation_matrix': correlation_matrix,
-                'significant_correlations': significant_correlations,
-                'outliers': outliers,
-                'summary_stats': summary_stats,
-                'data_points': len(df),
-                'metrics_analyzed': len(correlation_matrix.columns) if correlation_matrix is not None else 0
-            }
+            # Deep copy so callers can't modify the cached matrix or lists
+            return copy.deepcopy(self._cached_analysis(days_back, selected_subnet, latest_timestamp, row_count))
             
         except Exception as e:
             logger.error(f"Error in correlation analysis: {e}")
@@ -77,299 +199,270 @@ class CorrelationAnalysisService:
                 'summary_stats': {}
             }
     
-    def _get_analysis_data(self, days_back: int, selected_subnet: Optional[str] = None) -> pd.DataFrame:
-        """Get data for correlation analysis."""
-        session = get_db()
-        try:
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            
-            # Build query based on analysis type
-            # Use database-agnostic approach to avoid PostgreSQL parameter binding issues
-            from config import ACTIVE_DATABASE_URL
-            
-            if selected_subnet and selected_subnet != "all":
-                # Per-subnet time-series analysis - get more data for meaningful correlations
-                if 'postgresql' in ACTIVE_DATABASE_URL:
-                    # PostgreSQL syntax with direct date arithmetic
-                    sql = f"""
-                        SELECT 
-                            netuid, subnet_name, category, timestamp,
-                            -- Core metrics
-                            tao_score, stake_quality, buy_signal, emission_roi, trust_score,
-                            -- Market metrics
-                            market_cap_tao, fdv_tao, price_tao, price_1d_change, price_7d_change, 
-                            price_30d_change, price_1h_change, flow_24h, ath_60d, atl_60d,
-                            -- Volume metrics
-                            buy_volume_tao_1d, sell_volume_tao_1d, total_volume_tao_1d,
-                            buy_vol_tao_1d, sell_vol_tao_1d, buy_sell_ratio,
-                            net_volume_tao_1h, net_volume_tao_7d, total_volume_pct_change,
-                            -- Network metrics
-                            active_validators, validators_active, validator_util_pct, 
-                            total_stake_tao, max_validators, uid_count, active_stake_ratio,
-                            -- Stake metrics
-                            stake_hhi, gini_coeff_top_100, hhi, stake_quality_rank_pct,
-                            -- Flow metrics
-                            reserve_momentum, tao_in, alpha_circ, alpha_prop, root_prop,
-                            alpha_in, alpha_out, emission_pct, alpha_emitted_pct,
-                            -- Consensus metrics
-                            consensus_alignment, mean_consensus, pct_aligned, confidence,
-                            mean_incentive, p95_incentive,
-                            -- Emission metrics
-                            emission_owner, emission_miners, emission_validators,
-                            total_emission_tao, tao_in_emission, alpha_out_emission,
-                            realized_pnl_tao, unrealized_pnl_tao,
-                            -- Performance metrics
-                            momentum_rank_pct
-                        FROM metrics_snap 
-                        WHERE timestamp >= NOW() - INTERVAL '{days_back} days'
-                        AND netuid = {int(selected_subnet)}
-                        ORDER BY timestamp DESC
-                        LIMIT 5000
-                    """
-                    df = pd.read_sql(sql, session.bind)
-                else:
-                    # SQLite syntax with parameters
-                    sql = """
-                        SELECT 
-                            netuid, subnet_name, category, timestamp,
-                            -- Core metrics
-                            tao_score, stake_quality, buy_signal, emission_roi, trust_score,
-                            -- Market metrics
-                            market_cap_tao, fdv_tao, price_tao, price_1d_change, price_7d_change, 
-                            price_30d_change, price_1h_change, flow_24h, ath_60d, atl_60d,
-                            -- Volume metrics
-                            buy_volume_tao_1d, sell_volume_tao_1d, total_volume_tao_1d,
-                            buy_vol_tao_1d, sell_vol_tao_1d, buy_sell_ratio,
-                            net_volume_tao_1h, net_volume_tao_7d, total_volume_pct_change,
-                            -- Network metrics
-                            active_validators, validators_active, validator_util_pct, 
-                            total_stake_tao, max_validators, uid_count, active_stake_ratio,
-                            -- Stake metrics
-                            stake_hhi, gini_coeff_top_100, hhi, stake_quality_rank_pct,
-                            -- Flow metrics
-                            reserve_momentum, tao_in, alpha_circ, alpha_prop, root_prop,
-                            alpha_in, alpha_out, emission_pct, alpha_emitted_pct,
-                            -- Consensus metrics
-                            consensus_alignment, mean_consensus, pct_aligned, confidence,
-                            mean_incentive, p95_incentive,
-                            -- Emission metrics
-                            emission_owner, emission_miners, emission_validators,
-                            total_emission_tao, tao_in_emission, alpha_out_emission,
-                            realized_pnl_tao, unrealized_pnl_tao,
-                            -- Performance metrics
-                            momentum_rank_pct
-                        FROM metrics_snap 
-                        WHERE timestamp >= :cutoff_date
-                        AND netuid = :netuid
-                        ORDER BY timestamp DESC
-                        LIMIT 5000
-                    """
-                    df = pd.read_sql(sql, session.bind, params={
-                        'cutoff_date': cutoff_date,
-                        'netuid': int(selected_subnet)
-                    })
-            else:
-                # Network-wide analysis (latest data per subnet)
-                if 'postgresql' in ACTIVE_DATABASE_URL:
-                    # PostgreSQL syntax with direct date arithmetic
-                    sql = f"""
-                        SELECT m1.*
-                        FROM metrics_snap m1
-                        INNER JOIN (
-                            SELECT netuid, MAX(timestamp) as max_timestamp
-                            FROM metrics_snap
-                            WHERE timestamp >= NOW() - INTERVAL '{days_back} days'
-                            GROUP BY netuid
-                        ) m2 ON m1.netuid = m2.netuid AND m1.timestamp = m2.max_timestamp
-                        ORDER BY m1.netuid
-                        LIMIT 200
-                    """
-                    df = pd.read_sql(sql, session.bind)
-                else:
-                    # SQLite syntax with parameters
-                    sql = """
-                        SELECT m1.*
-                        FROM metrics_snap m1
-                        INNER JOIN (
-                            SELECT netuid, MAX(timestamp) as max_timestamp
-                            FROM metrics_snap
-                            WHERE timestamp >= :cutoff_date
-                            GROUP BY netuid
-                        ) m2 ON m1.netuid = m2.netuid AND m1.timestamp = m2.max_timestamp
-                        ORDER BY m1.netuid
-                        LIMIT 200
-                    """
-                    df = pd.read_sql(sql, session.bind, params={
-                        'cutoff_date': cutoff_date
-                    })
-            
-            # Ensure timestamp is properly converted
-            if 'timestamp' in df.columns:
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
+    def _compute_correlation_analysis(self, days_back: int, selected_subnet: Optional[str],
+                                      latest_timestamp: Optional[datetime], row_count: int) -> Dict[str, Any]:
+        """
+        Run the full correlation analysis (cached by get_correlation_analysis).
+        
+        Args:
+            days_back: Number of days of data to analyze
+            selected_subnet: Specific subnet to analyze, or None for network-wide
+            latest_timestamp: Latest snapshot timestamp, only used as part of the cache key
+            row_count: Snapshots in the window, only used as part of the cache key
             
-            return df
+        Returns:
+            Dictionary with correlation analysis results
+        """
+        # Get data
+        df = self._get_analysis_data(days_back, selected_subnet)
+        if df.empty:
+            return {
+                'success': False,
+                'error': 'No data available for analysis',
+                'correlation_matrix': None,
+                'significant_correlations': [],
+                'outliers': [],
+                'summary_stats': {}
+            }
+        
+        # Calculate correlations
+        correlation_matrix, sample_sizes = self._calculate_correlations(df)
+        significant_correlations = self._find_significant_correlations(df, correlation_matrix, sample_sizes)
+        outliers = self._detect_outliers(df)
+        summary_stats = self._calculate_summary_stats(df)
+        
+        return {
+            'success': True,
+            'correlation_matrix': correlation_matrix,
+            'significant_correlations': significant_correlations,
+            'outliers': outliers,
+            'summary_stats': summary_stats,
+            'data_points': len(df),
+            'metrics_analyzed': len(correlation_matrix.columns) if correlation_matrix is not None else 0
+        }
+    
+    def _probe_snapshot(self, days_back: int, selected_subnet: Optional[str] = None) -> Tuple[Optional[datetime], int]:
+        """
+        Get the latest snapshot timestamp and row count in the analysis window.
+        
+        Args:
+            days_back: Number of days of data to analyze
+            selected_subnet: Specific subnet to analyze, or None for network-wide
             
+        Returns:
+            Tuple of (latest timestamp or None, number of rows in the window)
+        """
+        session = get_db()
+        try:
+            where, params = _window_filter(days_back, selected_subnet)
+            latest_timestamp, row_count = session.execute(
+                text(f"SELECT MAX(timestamp), COUNT(*) FROM metrics_snap WHERE {where}"), params
+            ).one()
+            return latest_timestamp, row_count
         finally:
             session.close()
     
-    def _calculate_correlation_matrix(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate correlation matrix for available metrics."""
-        # Define comprehensive metric categories
-        core_metrics = ['tao_score', 'stake_quality', 'buy_signal', 'emission_roi', 'trust_score']
-        
-        # Market & Price metrics
-        market_metrics = [
-            'market_cap_tao', 'fdv_tao', 'price_tao', 'price_1d_change', 'price_7d_change', 
-            'price_30d_change', 'price_1h_change', 'flow_24h', 'ath_60d', 'atl_60d'
-        ]
-        
-        # Volume & Trading metrics
-        volume_metrics = [
-            'buy_volume_tao_1d', 'sell_volume_tao_1d', 'total_volume_tao_1d',
-            'buy_vol_tao_1d', 'sell_vol_tao_1d', 'buy_sell_ratio',
-            'net_volume_tao_1h', 'net_volume_tao_7d', 'total_volume_pct_change'
-        ]
+    def _get_analysis_data(self, days_back: int, selected_subnet: Optional[str] = None) -> pd.DataFrame:
+        """Get data for correlation analysis."""
+        from config import ACTIVE_DATABASE_URL
         
-        # Network & Validator metrics
-        network_metrics = [
-            'active_validators', 'validators_active', 'validator_util_pct', 
-            'total_stake_tao', 'max_validators', 'uid_count', 'active_stake_ratio'
-        ]
+        # Build query based on analysis type (one bound cutoff works on both databases)
+        where, params = _window_filter(days_back, selected_subnet)
         
-        # Stake distribution metrics
-        stake_metrics = [
-            'stake_hhi', 'gini_coeff_top_100', 'hhi', 'stake_quality_rank_pct'
-        ]
+        if selected_subnet and selected_subnet != "all":
+            # Per-subnet time-series analysis - get more data for meaningful correlations
+            sql = f"""
+                SELECT {_select_list()}
+                FROM metrics_snap
+                WHERE {where}
+                ORDER BY timestamp DESC
+                LIMIT 5000
+            """
+        elif 'postgresql' in ACTIVE_DATABASE_URL:
+            # Network-wide (latest data per subnet): PostgreSQL DISTINCT ON walks
+            # idx_metrics_snap_netuid_timestamp once
+            sql = f"""
+                SELECT DISTINCT ON (netuid) {_select_list()}
+                FROM metrics_snap
+                WHERE {where}
+                ORDER BY netuid, timestamp DESC
+                LIMIT 200
+            """
+        else:
+            # Network-wide (latest data per subnet): SQLite has no DISTINCT ON, so rank
+            # rows per subnet in one pass instead of joining against a MAX() subquery
+            sql = f"""
+                WITH ranked AS (
+                    SELECT {_select_list()},
+                           ROW_NUMBER() OVER (PARTITION BY netuid ORDER BY timestamp DESC) AS rn
+                    FROM metrics_snap
+                    WHERE {where}
+                )
+                SELECT {_select_list()}
+                FROM ranked
+                WHERE rn = 1
+                ORDER BY netuid
+                LIMIT 200
+            """
         
-        # Token flow & Emission metrics
-        flow_metrics = [
-            'reserve_momentum', 'tao_in', 'alpha_circ', 'alpha_prop', 'root_prop',
-            'alpha_in', 'alpha_out', 'emission_pct', 'alpha_emitted_pct'
-        ]
+        df = read_query_frame(sql, params=params)
         
-        # Consensus & Incentive metrics
-        consensus_metrics = [
-            'consensus_alignment', 'mean_consensus', 'pct_aligned', 'confidence',
-            'mean_incentive', 'p95_incentive'
-        ]
+        # Ensure timestamp is properly converted
+        if 'timestamp' in df.columns:
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
         
-        # Emission & PnL metrics
-        emission_metrics = [
-            'emission_owner', 'emission_miners', 'emission_validators',
-            'total_emission_tao', 'tao_in_emission', 'alpha_out_emission',
-            'realized_pnl_tao', 'unrealized_pnl_tao'
-        ]
+        return df
+    
+    def _calculate_correlation_matrix(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Calculate correlation matrix for available metrics."""
+        corr_matrix, _ = self._calculate_correlations(df)
+        return corr_matrix
+    
+    def _calculate_correlations(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """
+        Calculate the correlation matrix together with pairwise sample sizes.
         
-        # Performance & Momentum metrics
-        performance_metrics = [
-            'momentum_rank_pct'
-        ]
+        Args:
+            df: Analysis data
+            
+        Returns:
+            Tuple of (correlation matrix, sample sizes aligned with it or None if empty)
+        """
+        # Filter to available columns
+        available_cols = [col for col in CORR_COLUMNS if col in df.columns]
         
-        all_metrics = (core_metrics + market_metrics + volume_metrics + network_metrics + 
-                      stake_metrics + flow_metrics + consensus_metrics + emission_metrics + 
-                      performance_metrics)
+        if len(available_cols) < 2:
+            return pd.DataFrame(), None
         
-        # Filter to available columns
-        available_cols = [col for col in all_metrics if col in df.columns]
+        # Drop metrics with fewer than 3 numeric values
+        metrics = _numeric_metrics(df, available_cols)
+        available_cols = list(metrics.columns[metrics.notna().sum().to_numpy() >= 3])
         
         if len(available_cols) < 2:
-            return pd.DataFrame()
+            return pd.DataFrame(), None
         
-        # Calculate correlation matrix
-        corr_matrix = df[available_cols].corr()
+        # Calculate correlation matrix (pairwise-complete, matches DataFrame.corr())
+        values = metrics[available_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        r, n = _pairwise_pearson(values)
+        corr_matrix = pd.DataFrame(r, index=available_cols, columns=available_cols)
         
-        return corr_matrix
+        return corr_matrix, n
     
-    def _find_significant_correlations(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Find statistically significant correlations."""
-        corr_matrix = self._calculate_correlation_matrix(df)
+    def _find_significant_correlations(self, df: pd.DataFrame,
+                                       corr_matrix: Optional[pd.DataFrame] = None,
+                                       sample_sizes: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Find statistically significant correlations.
+        
+        Args:
+            df: Analysis data
+            corr_matrix: Correlation matrix already computed for df, or None to compute it
+            sample_sizes: Pairwise sample sizes aligned with corr_matrix, or None to count them
+            
+        Returns:
+            Top significant correlation pairs
+        """
+        if corr_matrix is None:
+            corr_matrix, sample_sizes = self._calculate_correlations(df)
         if corr_matrix.empty:
             return []
         
-        significant_pairs = []
-        
-        # Get upper triangle of correlation matrix
-        upper_triangle = np.triu(np.ones(corr_matrix.shape), k=1)
-        
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i + 1, len(corr_matrix.columns)):
-                metric1 = corr_matrix.columns[i]
-                metric2 = corr_matrix.columns[j]
-                correlation = corr_matrix.iloc[i, j]
-                
-                # Skip if correlation is NaN
-                if pd.isna(correlation):
-                    continue
-                
-                # Calculate p-value using scipy
-                try:
-                    # Get non-null values for both metrics
-                    valid_data = df[[metric1, metric2]].dropna()
-                    if len(valid_data) < 3:  # Need at least 3 data points
-                        continue
-                    
-                    # Calculate correlation and p-value
-                    corr_coef, p_value = stats.pearsonr(valid_data[metric1], valid_data[metric2])
-                    
-                    # Check if correlation is significant
-                    if abs(corr_coef) >= MIN_CORRELATION and p_value <= MAX_P_VALUE:
-                        significant_pairs.append({
-                            'metric1': metric1,
-                            'metric2': metric2,
-                            'correlation': round(corr_coef, 3),
-                            'p_value': round(p_value, 4),
-                            'sample_size': len(valid_data),
-                            'strength': 'Strong' if abs(corr_coef) >= 0.7 else 'Moderate' if abs(corr_coef) >= 0.5 else 'Weak'
-                        })
-                except Exception as e:
-                    logger.warning(f"Error calculating p-value for {metric1} vs {metric2}: {e}")
-                    continue
-        
-        # Sort by absolute correlation value
-        significant_pairs.sort(key=lambda x: abs(x['correlation']), reverse=True)
-        
-        return significant_pairs[:20]  # Return top 20 significant correlations
+        columns = list(corr_matrix.columns)
+        r = corr_matrix.to_numpy(dtype=np.float64)
+        
+        # Pairwise sample sizes: rows where both metrics are present
+        n = sample_sizes
+        if n is None:
+            present = _numeric_metrics(df, columns).notna().to_numpy(dtype=np.float64)
+            n = present.T @ present
+        
+        # Gather the upper triangle pairs once
+        i_idx, j_idx = np.triu_indices(len(columns), k=1)
+        r_pairs = r[i_idx, j_idx]
+        n_pairs = n[i_idx, j_idx]
+        
+        # Two-sided p-values as in scipy.stats.pearsonr: with dof = n - 2 and
+        # t^2 = r^2 * dof / (1 - r^2), p = I_x(dof/2, 1/2) at x = dof / (dof + t^2) = 1 - r^2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dof = np.where(n_pairs > 2, n_pairs - 2, np.nan)
+            p_pairs = special.betainc(0.5 * dof, 0.5, np.clip(1.0 - r_pairs * r_pairs, 0.0, 1.0))
+        
+        # Keep significant pairs (need at least 3 data points)
+        significant = (n_pairs >= 3) & (np.abs(r_pairs) >= MIN_CORRELATION) & (p_pairs <= MAX_P_VALUE)
+        
+        # Select the top 20 by absolute correlation without sorting every significant pair
+        candidates = np.flatnonzero(significant)
+        abs_r = np.abs(r_pairs[candidates])
+        if len(candidates) > 20:
+            top = np.argpartition(-abs_r, 19)[:20]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-abs_r[top], kind='stable')]
+        
+        # Gather the winners' fields as arrays, then build the records in one pass
+        winners = candidates[top]
+        metric_names = np.asarray(columns, dtype=object)
+        metric1, metric2 = metric_names[i_idx[winners]], metric_names[j_idx[winners]]
+        correlations = r_pairs[winners].tolist()
+        p_values = p_pairs[winners].tolist()
+        sample_sizes = n_pairs[winners].astype(np.int64).tolist()
+        
+        return [  # Top 20 significant correlations
+            {
+                'metric1': m1,
+                'metric2': m2,
+                'correlation': round(corr_coef, 3),
+                'p_value': round(p_value, 4),
+                'sample_size': sample_size,
+                'strength': 'Strong' if abs(corr_coef) >= 0.7 else 'Moderate' if abs(corr_coef) >= 0.5 else 'Weak'
+            }
+            for m1, m2, corr_coef, p_value, sample_size in zip(metric1, metric2, correlations, p_values, sample_sizes)
+        ]
     
     def _detect_outliers(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """Detect statistical outliers in the data."""
-        outliers = []
+        cols = [metric for metric in OUTLIER_METRICS if metric in df.columns]
+        if not cols:
+            return []
         
-        # Define metrics to check for outliers
-        outlier_metrics = ['tao_score', 'stake_quality', 'market_cap_tao', 'total_stake_tao', 'active_validators']
+        values = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
         
-        for metric in outlier_metrics:
-            if metric not in df.columns:
-                continue
-            
-            # Get non-null values
-            values = df[metric].dropna()
-            if len(values) < 3:
-                continue
-            
-            # Calculate z-scores
-            z_scores = np.abs(stats.zscore(values))
-            
-            # Find outliers
-            outlier_indices = np.where(z_scores > Z_SCORE_THRESHOLD)[0]
-            
-            for idx in outlier_indices:
-                original_idx = values.index[idx]
-                row = df.loc[original_idx]
-                
-                outliers.append({
-                    'subnet_name': row.get('subnet_name', 'Unknown'),
-                    'netuid': row.get('netuid', 'Unknown'),
-                    'metric': metric,
-                    'value': round(float(values.iloc[idx]), 2),
-                    'z_score': round(float(z_scores[idx]), 2),
-                    'mean': round(float(values.mean()), 2),
-                    'std': round(float(values.std()), 2)
-                })
-        
-        # Sort by z-score
-        outliers.sort(key=lambda x: x['z_score'], reverse=True)
-        
-        return outliers[:15]  # Return top 15 outliers
+        # Calculate z-scores for all metrics at once (population std, as scipy.stats.zscore)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            counts = np.count_nonzero(~np.isnan(values), axis=0)
+            means = np.nansum(values, axis=0) / counts
+            sum_sq = np.nansum((values - means) ** 2, axis=0)
+            stds = np.sqrt(sum_sq / (counts - 1))
+            z_scores = np.abs((values - means) / np.sqrt(sum_sq / counts))
+        
+        # Need at least 3 non-null values per metric
+        z_scores[:, counts < 3] = np.nan
+        
+        # Find outliers, grouped by metric
+        col_idx, row_idx = np.nonzero(z_scores.T > Z_SCORE_THRESHOLD)
+        if len(row_idx) == 0:
+            return []
+        
+        # Sort by z-score and keep the top 15
+        outlier_z = z_scores[row_idx, col_idx]
+        order = np.argsort(-outlier_z, kind='stable')[:15]
+        row_idx, col_idx, outlier_z = row_idx[order], col_idx[order], outlier_z[order]
+        
+        subnet_names = df['subnet_name'].to_numpy()[row_idx] if 'subnet_name' in df.columns else ['Unknown'] * len(row_idx)
+        netuids = df['netuid'].to_numpy()[row_idx] if 'netuid' in df.columns else ['Unknown'] * len(row_idx)
+        
+        return [
+            {
+                'subnet_name': subnet_name,
+                'netuid': netuid,
+                'metric': cols[col],
+                'value': round(float(values[row, col]), 2),
+                'z_score': round(float(z_score), 2),
+                'mean': round(float(means[col]), 2),
+                'std': round(float(stds[col]), 2)
+            }
+            for subnet_name, netuid, row, col, z_score in zip(subnet_names, netuids, row_idx, col_idx, outlier_z)
+        ]
     
     def _calculate_summary_stats(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate summary statistics for the dataset."""
@@ -383,20 +476,27 @@ class CorrelationAnalysisService:
         }
         
         # Add metric-specific statistics
-        key_metrics = ['tao_score', 'stake_quality', 'market_cap_tao', 'total_stake_tao']
-        
-        for metric in key_metrics:
-            if metric in df.columns:
-                values = df[metric].dropna()
-                if len(values) > 0:
-                    summary[metric] = {
-                        'mean': round(float(values.mean()), 2),
-                        'median': round(float(values.median()), 2),
-                        'std': round(float(values.std()), 2),
-                        'min': round(float(values.min()), 2),
-                        'max': round(float(values.max()), 2),
-                        'count': len(values)
-                    }
+        cols = [metric for metric in SUMMARY_METRICS if metric in df.columns]
+        
+        # Skip all-NaN metrics up front so the reductions never see an empty slice
+        metrics = df[cols].dropna(axis=1, how='all')
+        if metrics.columns.empty:
+            return summary
+        
+        # Reduce all key metrics in one aggregation pass
+        metric_stats = metrics.agg(['mean', 'median', 'std', 'min', 'max', 'count'])
+        
+        for metric in metrics.columns:
+            count = int(metric_stats.at['count', metric])
+            if count > 0:
+                summary[metric] = {
+                    'mean': round(float(metric_stats.at['mean', metric]), 2),
+                    'median': round(float(metric_stats.at['median', metric]), 2),
+                    'std': round(float(metric_stats.at['std', metric]), 2),
+                    'min': round(float(metric_stats.at['min', metric]), 2),
+                    'max': round(float(metric_stats.at['max', metric]), 2),
+                    'count': count
+                }
         
         return summary
 
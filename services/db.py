@@ -1,13 +1,26 @@
 import os, json, pandas as pd
 import re
 import signal
+import logging
 from contextlib import contextmanager
-from sqlalchemy import create_engine, text, select, func, String, and_, Numeric, or_
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import create_engine, event, make_url, text, select, func, String, Integer, and_, Numeric, or_
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import sessionmaker
-from .db_utils import json_field, get_database_type
-from models import SubnetMeta, ScreenerRaw
+from .cache import frame_cache
+from .db_utils import get_database_type
+from models import SubnetMeta, ScreenerRaw, engine as models_engine
 from config import TAO_SCORE_COLUMN
 
+logger = logging.getLogger(__name__)
+
+# Optional native PostgreSQL reader used by read_query_frame()
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
+
 # Use HEROKU_DATABASE_URL for scripts that need to write to Heroku
 # Use DATABASE_URL for the main app (defaults to SQLite for development)
 HEROKU_DATABASE_URL = os.getenv("HEROKU_DATABASE_URL")
@@ -26,6 +39,8 @@ if ACTIVE_DATABASE_URL.startswith("postgres://"):
 # Configure connection pooling for Heroku PostgreSQL
 if ACTIVE_DATABASE_URL.startswith("postgresql://"):
     # Heroku PostgreSQL connection pool configuration
+    # Sized for sync gunicorn workers (one request at a time each); workers x (pool_size +
+    # max_overflow) must stay under the Heroku plan's connection limit
     engine = create_engine(
         ACTIVE_DATABASE_URL,
         pool_pre_ping=True,
@@ -37,7 +52,40 @@ if ACTIVE_DATABASE_URL.startswith("postgresql://"):
     )
 else:
     # SQLite configuration (development)
-    engine = create_engine(ACTIVE_DATABASE_URL, pool_pre_ping=True, future=True)
+    # Keep the default QueuePool: a single StaticPool connection would be
+    # shared by concurrent Dash callbacks. The busy timeout lets readers wait out a cron write.
+    engine = create_engine(
+        ACTIVE_DATABASE_URL,
+        pool_pre_ping=True,
+        # Seconds to wait on a locked database (postgresql+driver:// URLs also land here)
+        connect_args={'timeout': 10} if make_url(ACTIVE_DATABASE_URL).get_backend_name() == 'sqlite' else {},
+        future=True
+    )
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection; WAL lets dashboard reads run while cron writes."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA busy_timeout=10000")  # Same wait as connect_args, for models.engine
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    cursor.close()
+
+def _set_sqlite_mmap(dbapi_connection, connection_record):
+    """Read up to 256 MB of the SQLite file via mmap, without copying into the page cache."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+# The collectors also write through models.engine, so tune its connections too
+for sqlite_engine in (engine, models_engine):
+    if sqlite_engine.dialect.name == 'sqlite':
+        event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
+        event.listen(sqlite_engine, "connect", _set_sqlite_mmap)
+if models_engine.dialect.name == 'sqlite':
+    # models.engine pooled an untuned connection for create_all at import; drop it
+    models_engine.dispose()
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, future=True)
 
@@ -68,6 +116,13 @@ def sanitize_search_input(search_text):
     # Limit length
     return sanitized[:100]
 
+def optimize_database():
+    """Refresh SQLite query planner statistics after bulk writes (PostgreSQL autovacuum does this itself)."""
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+
 def get_db():
     """Get database session with timeout protection."""
     db = SessionLocal()
@@ -94,32 +149,144 @@ def safe_query_execute(query, timeout_seconds=30, limit=10000):
         print(f"Query execution error: {e}")
         raise
 
+# Bind values read_query_frame() may inline for connectorx: typed literals, never free text
+_INLINE_BIND_TYPES = (int, float, Decimal, date, datetime)
+
+def _binds_inlinable(query):
+    """Check every bind value in a query is a number, date or NULL."""
+    params = query.compile(dialect=postgresql.dialect()).params
+    return all(value is None or isinstance(value, _INLINE_BIND_TYPES) for value in params.values())
+
+def read_query_frame(query, params=None):
+    """
+    Execute a query and return the result as a DataFrame.
+    
+    On PostgreSQL the query goes through connectorx when it is installed, which builds
+    the columns natively instead of boxing every row as Python tuples first.
+    connectorx has no bind parameters, so only queries whose binds are all numbers or
+    dates take that path, with the values inlined. Text binds such as search terms,
+    SQLite, or a connectorx failure use the SQLAlchemy connection with real binds.
+    
+    Args:
+        query: SQLAlchemy select, or SQL text with :name placeholders
+        params: Bind parameters for SQL text
+        
+    Returns:
+        DataFrame with one column per selected label
+    """
+    if isinstance(query, str):
+        query = text(query).bindparams(**(params or {}))
+    
+    if cx is not None and engine.dialect.name == 'postgresql' and _binds_inlinable(query):
+        try:
+            # Compile with the named paramstyle so LIKE patterns keep single % signs
+            sql = str(query.compile(dialect=postgresql.dialect(paramstyle='named'),
+                                    compile_kwargs={'literal_binds': True}))
+            # connectorx expects a plain postgresql:// URL without the SQLAlchemy driver suffix
+            url = ACTIVE_DATABASE_URL.replace('postgresql+psycopg2://', 'postgresql://', 1)
+            return cx.read_sql(url, sql, return_type='pandas')
+        except Exception as e:
+            logger.warning(f"connectorx read failed, falling back to SQLAlchemy: {e}")
+    
+    with engine.connect() as conn:
+        result = conn.execute(query)
+        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+def data_version():
+    """
+    Return the latest write stamps of the tables behind the frame loaders.
+    
+    One round-trip of MAX() lookups; the tuple changes whenever a fetch, a metrics
+    snapshot or an enrichment run lands, so it is used as the frame cache key.
+    
+    Returns:
+        Tuple of (latest screener fetch, latest metrics snapshot, latest subnet_meta
+        update, subnet_meta row count)
+    """
+    from models import MetricsSnap
+    
+    query = select(
+        select(func.max(ScreenerRaw.fetched_at)).scalar_subquery(),
+        select(func.max(MetricsSnap.timestamp)).scalar_subquery(),
+        select(func.max(SubnetMeta.updated_at)).scalar_subquery(),
+        select(func.count(SubnetMeta.netuid)).scalar_subquery(),
+    )
+    with engine.connect() as conn:
+        return tuple(conn.execute(query).one())
+
+def _cached_frame(loader, *args):
+    """Serve a loader's DataFrame from frame_cache while the data version is unchanged."""
+    key = frame_cache._generate_key(loader.__name__, *args, *data_version())
+    df = frame_cache.get(key)
+    if df is None:
+        df = loader(*args)
+        frame_cache.set(key, df)
+    # Callers add and overwrite columns, so hand out a copy of the cached frame
+    return df.copy()
+
+def _zero_if_null(column, label=None):
+    """Select a numeric column with NULL read as zero, so frames need no pandas coercion pass."""
+    zero = 0 if isinstance(column.type, Integer) else 0.0
+    return func.coalesce(column, zero).label(label or column.key)
+
+def latest_metrics_snap():
+    """
+    Subquery with the latest MetricsSnap (netuid, timestamp) for each subnet.
+    
+    Each subnet costs one backward seek on idx_metrics_snap_netuid_timestamp, so the
+    lookup stays flat as snapshots accumulate (a GROUP BY would scan all of them).
+    PostgreSQL gets a LATERAL ... ORDER BY timestamp DESC LIMIT 1; SQLite has no
+    LATERAL and resolves the per-subnet MAX() with the same index seek.
+    Join it to SubnetMeta on netuid, then to MetricsSnap on (netuid, timestamp).
+    
+    Returns:
+        Subquery exposing netuid and timestamp columns
+    """
+    from models import MetricsSnap
+    
+    if engine.dialect.name == 'postgresql':
+        return (
+            select(MetricsSnap.netuid, MetricsSnap.timestamp)
+            .where(MetricsSnap.netuid == SubnetMeta.netuid)
+            .order_by(MetricsSnap.timestamp.desc())
+            .limit(1)
+            .correlate(SubnetMeta)
+            .lateral('latest_metrics_snap')
+        )
+    
+    latest_timestamp = (
+        select(func.max(MetricsSnap.timestamp))
+        .where(MetricsSnap.netuid == SubnetMeta.netuid)
+        .correlate(SubnetMeta)
+        .scalar_subquery()
+    )
+    return select(SubnetMeta.netuid, latest_timestamp.label('timestamp')).subquery('latest_metrics_snap')
+
 def get_base_query():
     """Get base query with database-agnostic JSON extraction using SQLAlchemy ORM."""
     from models import MetricsSnap
     
-    # Use SQLAlchemy ORM with JSON helper and TAO scores - simplified to avoid casting issues
+    # Join the latest snapshot per subnet instead of a correlated MAX() per row
+    latest = latest_metrics_snap()
+    
+    # Use SQLAlchemy ORM with typed screener columns and TAO scores
     query = select(
         SubnetMeta,
-        json_field(ScreenerRaw.raw_json, 'market_cap_tao').label('mcap_tao'),
-        json_field(ScreenerRaw.raw_json, 'net_volume_tao_24h').label('flow_24h'),
-        json_field(ScreenerRaw.raw_json, 'net_volume_tao_7d').label('net_volume_tao_7d'),
-        json_field(ScreenerRaw.raw_json, 'github_repo').label('github_url'),
-        json_field(ScreenerRaw.raw_json, 'subnet_url').label('website_url'),
-        getattr(MetricsSnap, TAO_SCORE_COLUMN).label('tao_score')
+        _zero_if_null(ScreenerRaw.market_cap_tao, 'mcap_tao'),
+        _zero_if_null(ScreenerRaw.net_volume_tao_24h, 'flow_24h'),
+        _zero_if_null(ScreenerRaw.net_volume_tao_7d, 'net_volume_tao_7d'),
+        ScreenerRaw.github_repo.label('github_url'),
+        ScreenerRaw.subnet_url.label('website_url'),
+        _zero_if_null(getattr(MetricsSnap, TAO_SCORE_COLUMN), 'tao_score')
     ).select_from(
         SubnetMeta.__table__
         .outerjoin(ScreenerRaw.__table__, SubnetMeta.netuid == ScreenerRaw.netuid)
+        .outerjoin(latest, SubnetMeta.netuid == latest.c.netuid)
         .outerjoin(
             MetricsSnap.__table__, 
             and_(
-                SubnetMeta.netuid == MetricsSnap.netuid,
-                MetricsSnap.timestamp == (
-                    select(func.max(MetricsSnap.timestamp))
-                    .where(MetricsSnap.netuid == SubnetMeta.netuid)
-                    .correlate(SubnetMeta)
-                    .scalar_subquery()
-                )
+                latest.c.netuid == MetricsSnap.netuid,
+                latest.c.timestamp == MetricsSnap.timestamp
             )
         )
     ).where(
@@ -131,6 +298,10 @@ def get_base_query():
 
 def load_subnet_frame(category="All", search=""):
     """Return pandas DF filtered by category & search text."""
+    return _cached_frame(_load_subnet_frame, category, search)
+
+def _load_subnet_frame(category, search):
+    """Query the subnet frame for load_subnet_frame()."""
     query = get_base_query()
     
     # Sanitize inputs
@@ -218,126 +389,98 @@ def load_subnet_frame(category="All", search=""):
         print(f"Search debug - Original: '{search}', Greek: '{greek_search}', Conditions: {len(search_conditions)}")
     
     # Execute query and convert to DataFrame
-    with engine.connect() as conn:
-        result = conn.execute(query)
-        rows = result.fetchall()
-        columns = list(result.keys())
-        df = pd.DataFrame(rows, columns=columns)
-    
-    # ensure numeric with proper defaults
-    df["mcap_tao"] = pd.to_numeric(df["mcap_tao"], errors="coerce").fillna(0.0)
-    df["flow_24h"] = pd.to_numeric(df["flow_24h"], errors="coerce").fillna(0.0)
-    df["net_volume_tao_7d"] = pd.to_numeric(df["net_volume_tao_7d"], errors="coerce").fillna(0.0)
-    df["tao_score"] = pd.to_numeric(df["tao_score"], errors="coerce").fillna(0.0)
+    df = read_query_frame(query)
     return df
 
 def load_screener_frame():
     """Return pandas DF optimized for screener charts with latest metrics."""
+    return _cached_frame(_load_screener_frame)
+
+def _load_screener_frame():
+    """Query the screener frame for load_screener_frame()."""
     from models import MetricsSnap
     
+    latest = latest_metrics_snap()
+    
     query = select(
         SubnetMeta.netuid,
         SubnetMeta.subnet_name,
         SubnetMeta.primary_category,
         # Price and market data
-        json_field(ScreenerRaw.raw_json, 'price_tao').label('price_tao'),
-        json_field(ScreenerRaw.raw_json, 'market_cap_tao').label('market_cap_tao'),
-        json_field(ScreenerRaw.raw_json, 'fdv_tao').label('fdv_tao'),
-        json_field(ScreenerRaw.raw_json, 'total_stake_tao').label('total_stake_tao'),
-        json_field(ScreenerRaw.raw_json, 'tao_in').label('tao_in'),
-        json_field(ScreenerRaw.raw_json, 'buy_volume_tao_1d').label('buy_volume_tao_1d'),
+        _zero_if_null(ScreenerRaw.price_tao, 'price_tao'),
+        _zero_if_null(ScreenerRaw.market_cap_tao, 'market_cap_tao'),
+        _zero_if_null(ScreenerRaw.fdv_tao, 'fdv_tao'),
+        _zero_if_null(ScreenerRaw.total_stake_tao, 'total_stake_tao'),
+        _zero_if_null(ScreenerRaw.tao_in, 'tao_in'),
+        _zero_if_null(ScreenerRaw.buy_volume_tao_1d, 'buy_volume_tao_1d'),
         # Price changes from MetricsSnap
-        MetricsSnap.price_1h_change,
-        MetricsSnap.price_1d_change,
-        MetricsSnap.price_7d_change,
-        MetricsSnap.price_30d_change,
+        _zero_if_null(MetricsSnap.price_1h_change),
+        _zero_if_null(MetricsSnap.price_1d_change),
+        _zero_if_null(MetricsSnap.price_7d_change),
+        _zero_if_null(MetricsSnap.price_30d_change),
         # Volume analysis
-        MetricsSnap.sell_volume_tao_1d,
-        MetricsSnap.total_volume_tao_1d,
-        MetricsSnap.buy_sell_ratio,
-        MetricsSnap.net_volume_tao_1h,
-        MetricsSnap.net_volume_tao_7d,
-        MetricsSnap.buy_volume_pct_change,
-        MetricsSnap.sell_volume_pct_change,
-        MetricsSnap.total_volume_pct_change,
+        _zero_if_null(MetricsSnap.sell_volume_tao_1d),
+        _zero_if_null(MetricsSnap.total_volume_tao_1d),
+        _zero_if_null(MetricsSnap.buy_sell_ratio),
+        _zero_if_null(MetricsSnap.net_volume_tao_1h),
+        _zero_if_null(MetricsSnap.net_volume_tao_7d),
+        _zero_if_null(MetricsSnap.buy_volume_pct_change),
+        _zero_if_null(MetricsSnap.sell_volume_pct_change),
+        _zero_if_null(MetricsSnap.total_volume_pct_change),
         # Flow and momentum (legacy)
-        json_field(ScreenerRaw.raw_json, 'net_volume_tao_24h').label('flow_24h'),
+        _zero_if_null(ScreenerRaw.net_volume_tao_24h, 'flow_24h'),
         # Network health
-        MetricsSnap.uid_count,
-        MetricsSnap.active_validators,
-        MetricsSnap.validators_active,
-        MetricsSnap.max_validators,
+        _zero_if_null(MetricsSnap.uid_count),
+        _zero_if_null(MetricsSnap.active_validators),
+        _zero_if_null(MetricsSnap.validators_active),
+        _zero_if_null(MetricsSnap.max_validators),
         # Stake distribution
-        MetricsSnap.stake_hhi,
-        MetricsSnap.hhi,
-        MetricsSnap.gini_coeff_top_100,
+        _zero_if_null(MetricsSnap.stake_hhi),
+        _zero_if_null(MetricsSnap.hhi),
+        _zero_if_null(MetricsSnap.gini_coeff_top_100),
         # Core metrics from MetricsSnap
-        MetricsSnap.reserve_momentum,
-        MetricsSnap.stake_quality,
-        MetricsSnap.validator_util_pct,
-        MetricsSnap.active_stake_ratio,
-        MetricsSnap.consensus_alignment,
-        MetricsSnap.emission_pct,
-        MetricsSnap.alpha_emitted_pct,
-        MetricsSnap.emission_roi,
-        MetricsSnap.tao_in_emission,
-        getattr(MetricsSnap, TAO_SCORE_COLUMN).label('tao_score'),
-        MetricsSnap.stake_quality_rank_pct,
-        MetricsSnap.momentum_rank_pct,
+        _zero_if_null(MetricsSnap.reserve_momentum),
+        _zero_if_null(MetricsSnap.stake_quality),
+        _zero_if_null(MetricsSnap.validator_util_pct),
+        _zero_if_null(MetricsSnap.active_stake_ratio),
+        _zero_if_null(MetricsSnap.consensus_alignment),
+        _zero_if_null(MetricsSnap.emission_pct),
+        _zero_if_null(MetricsSnap.alpha_emitted_pct),
+        _zero_if_null(MetricsSnap.emission_roi),
+        _zero_if_null(MetricsSnap.tao_in_emission),
+        _zero_if_null(getattr(MetricsSnap, TAO_SCORE_COLUMN), 'tao_score'),
+        _zero_if_null(MetricsSnap.stake_quality_rank_pct),
+        _zero_if_null(MetricsSnap.momentum_rank_pct),
         # PnL and performance
-        MetricsSnap.realized_pnl_tao,
-        MetricsSnap.unrealized_pnl_tao,
-        MetricsSnap.ath_60d,
-        MetricsSnap.atl_60d,
+        _zero_if_null(MetricsSnap.realized_pnl_tao),
+        _zero_if_null(MetricsSnap.unrealized_pnl_tao),
+        _zero_if_null(MetricsSnap.ath_60d),
+        _zero_if_null(MetricsSnap.atl_60d),
         # Token flow
-        MetricsSnap.alpha_in,
-        MetricsSnap.alpha_out,
-        MetricsSnap.alpha_circ,
-        MetricsSnap.alpha_prop,
-        MetricsSnap.root_prop,
+        _zero_if_null(MetricsSnap.alpha_in),
+        _zero_if_null(MetricsSnap.alpha_out),
+        _zero_if_null(MetricsSnap.alpha_circ),
+        _zero_if_null(MetricsSnap.alpha_prop),
+        _zero_if_null(MetricsSnap.root_prop),
         # Timestamps
         MetricsSnap.timestamp.label('metrics_timestamp'),
         ScreenerRaw.fetched_at.label('screener_timestamp')
     ).select_from(
         SubnetMeta.__table__
         .outerjoin(ScreenerRaw.__table__, SubnetMeta.netuid == ScreenerRaw.netuid)
-        .outerjoin(MetricsSnap.__table__, SubnetMeta.netuid == MetricsSnap.netuid)
-    ).where(
         # Get latest metrics for each subnet
-        MetricsSnap.timestamp == (
-            select(func.max(MetricsSnap.timestamp))
-            .where(MetricsSnap.netuid == SubnetMeta.netuid)
-            .correlate(SubnetMeta)
-            .scalar_subquery()
+        .join(latest, SubnetMeta.netuid == latest.c.netuid)
+        .join(
+            MetricsSnap.__table__,
+            and_(
+                latest.c.netuid == MetricsSnap.netuid,
+                latest.c.timestamp == MetricsSnap.timestamp
+            )
         )
     )
     
     # Execute query and convert to DataFrame
-    with engine.connect() as conn:
-        result = conn.execute(query)
-        rows = result.fetchall()
-        columns = list(result.keys())
-        df = pd.DataFrame(rows, columns=columns)
-    
-    # Ensure numeric with proper defaults
-    numeric_columns = [
-        'price_tao', 'market_cap_tao', 'fdv_tao', 'total_stake_tao', 'tao_in', 
-        'buy_volume_tao_1d', 'price_1h_change', 'price_1d_change', 'price_7d_change', 'price_30d_change',
-        'sell_volume_tao_1d', 'total_volume_tao_1d', 'buy_sell_ratio', 'net_volume_tao_1h', 'net_volume_tao_7d',
-        'buy_volume_pct_change', 'sell_volume_pct_change', 'total_volume_pct_change', 'flow_24h',
-        'uid_count', 'active_validators', 'validators_active', 'max_validators',
-        'stake_hhi', 'hhi', 'gini_coeff_top_100', 'reserve_momentum', 'stake_quality', 
-        'validator_util_pct', 'active_stake_ratio', 'consensus_alignment', 'emission_pct', 
-        'alpha_emitted_pct', 'emission_roi', 'tao_in_emission', 'tao_score', 'stake_quality_rank_pct', 'momentum_rank_pct',
-        'realized_pnl_tao', 'unrealized_pnl_tao', 'ath_60d', 'atl_60d',
-        'alpha_in', 'alpha_out', 'alpha_circ', 'alpha_prop', 'root_prop'
-    ]
-    
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
-    
-
+    df = read_query_frame(query)
     
     return df 
 
@@ -434,16 +577,7 @@ def search_subnets(query=None, category=None, return_type='dataframe', limit=10)
         query_obj = query_obj.where(or_(*search_conditions))
     
     # Execute query and convert to DataFrame
-    with engine.connect() as conn:
-        result = conn.execute(query_obj)
-        rows = result.fetchall()
-        columns = list(result.keys())
-        df = pd.DataFrame(rows, columns=columns)
-    
-    # Ensure numeric with proper defaults (for Dash)
-    for col in ["mcap_tao", "flow_24h", "net_volume_tao_7d", "tao_score"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0.0)
+    df = read_query_frame(query_obj)
     
     if return_type == 'dataframe':
         return df
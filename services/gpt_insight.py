@@ -6,8 +6,10 @@ Provides AI-powered subnet analysis with 24-hour database caching.
 import os
 import logging
 from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-from openai import OpenAI
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from .db import get_db
 from models import GptInsights, MetricsSnap, SubnetMeta, CategoryStats
@@ -15,14 +17,38 @@ from config import OPENAI_KEY, TAO_SCORE_COLUMN
 
 logger = logging.getLogger(__name__)
 
-# Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
+# OpenAI client, created on first use so cache-only paths never import the SDK
+_client = None
+
+def _get_client():
+    """Get the OpenAI client, or None if no API key is configured."""
+    global _client
+    if _client is None and OPENAI_KEY:
+        from openai import OpenAI
+        _client = OpenAI(api_key=OPENAI_KEY)
+    return _client
 
 # GPT Insight Configuration
 MODEL_NAME = "gpt-4o-2024-05-13"
 MAX_WORDS = 300  # Increased from 200 to allow for complete insights
 MAX_TOKENS = 1600  # Increased to prevent truncation
 
+# Streamlined GPT Prompt Template (built once, filled with the subnet context per call)
+SYSTEM_PROMPT = """You are a professional Bittensor subnet analyst. Write ≤150 words. Start with subnet name. End with: "Buy-Signal: X/5".
+
+Analysis should be data-driven, include specific numbers, mention mission, compare to peers, and assess current state vs potential."""
+
+USER_PROMPT_TEMPLATE = """Context:
+{context}
+
+Analysis Structure:
+1. **Mission**: One sentence on what the subnet does
+2. **Network Health**: Stake quality, validator utilization, consensus alignment with numbers and peer comparison
+3. **Token Economics**: Inflation rate, emission progress, reserve momentum impact
+4. **Market Performance**: Price trends, momentum ranking, market positioning
+5. **Investment Thesis**: Combine metrics to assess value vs potential
+6. **Buy-Signal**: Rate 1-5 based on network health, economics, performance, and mission. Weight validator utilization, momentum, and inflation equally. Round down in borderline cases."""
+
 
 
 def get_cached_insight(netuid: int) -> Optional[str]:
@@ -45,11 +71,11 @@ def get_cached_insight(netuid: int) -> Optional[str]:
                 logger.info(f"No cached insight found for subnet {netuid}")
                 return None
             
-            # Get the latest metrics timestamp for this subnet
-            latest_metrics = session.query(MetricsSnap).filter_by(netuid=netuid)\
-                .order_by(MetricsSnap.timestamp.desc()).first()
+            # Get the latest metrics timestamp for this subnet (timestamp only, not the full row)
+            latest_timestamp = session.query(func.max(MetricsSnap.timestamp))\
+                .filter(MetricsSnap.netuid == netuid).scalar()
             
-            if not latest_metrics or not latest_metrics.timestamp:
+            if not latest_timestamp:
                 logger.warning(f"No metrics data found for subnet {netuid}, using fallback TTL")
                 # Fallback to 12-hour TTL if no metrics data available
                 cutoff_time = datetime.utcnow() - timedelta(hours=12)
@@ -61,9 +87,9 @@ def get_cached_insight(netuid: int) -> Optional[str]:
                     return cached_insight.text
             
             # Data-driven caching: check if metrics data is newer than cached insight
-            if latest_metrics.timestamp > cached_insight.ts:
+            if latest_timestamp > cached_insight.ts:
                 logger.info(f"Metrics data updated for subnet {netuid} since last insight generation")
-                logger.info(f"Latest metrics: {latest_metrics.timestamp}, cached insight: {cached_insight.ts}")
+                logger.info(f"Latest metrics: {latest_timestamp}, cached insight: {cached_insight.ts}")
                 return None
             else:
                 logger.info(f"Using cached insight for subnet {netuid} (data unchanged)")
@@ -86,22 +112,15 @@ def save_insight_to_db(netuid: int, text: str) -> bool:
     """
     try:
         with get_db() as session:
-            # Use upsert logic: INSERT ... ON CONFLICT DO UPDATE
-            existing = session.query(GptInsights).filter_by(netuid=netuid).first()
-            
-            if existing:
-                # Update existing record
-                existing.text = text
-                existing.ts = datetime.utcnow()
-            else:
-                # Create new record
-                new_insight = GptInsights(
-                    netuid=netuid,
-                    text=text,
-                    ts=datetime.utcnow()
-                )
-                session.add(new_insight)
-            
+            # Use upsert logic: INSERT ... ON CONFLICT DO UPDATE (one statement, no prior SELECT)
+            now = datetime.now(timezone.utc).replace(tzinfo=None)  # Naive UTC, like the ts column
+            insert = pg_insert if session.bind.dialect.name == 'postgresql' else sqlite_insert
+            stmt = insert(GptInsights).values(netuid=netuid, text=text, ts=now)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[GptInsights.netuid],
+                set_={'text': stmt.excluded.text, 'ts': stmt.excluded.ts, 'updated_at': now}
+            )
+            session.execute(stmt)
             session.commit()
             logger.info(f"Saved insight for subnet {netuid}")
             return True
@@ -226,6 +245,7 @@ def generate_insight(netuid: int) -> str:
     Returns:
         Generated insight text
     """
+    client = _get_client()
     if not client:
         return "GPT analysis unavailable - API key not configured."
     
@@ -264,29 +284,15 @@ def generate_insight(netuid: int) -> str:
         
         context = "\n".join(context_lines)
         
-        # Streamlined GPT Prompt Template
-        system_prompt = """You are a professional Bittensor subnet analyst. Write ≤150 words. Start with subnet name. End with: "Buy-Signal: X/5".
-
-Analysis should be data-driven, include specific numbers, mention mission, compare to peers, and assess current state vs potential."""
-
-        user_prompt = f"""Context:
-{context}
-
-Analysis Structure:
-1. **Mission**: One sentence on what the subnet does
-2. **Network Health**: Stake quality, validator utilization, consensus alignment with numbers and peer comparison
-3. **Token Economics**: Inflation rate, emission progress, reserve momentum impact
-4. **Market Performance**: Price trends, momentum ranking, market positioning
-5. **Investment Thesis**: Combine metrics to assess value vs potential
-6. **Buy-Signal**: Rate 1-5 based on network health, economics, performance, and mission. Weight validator utilization, momentum, and inflation equally. Round down in borderline cases."""
-
+        user_prompt = USER_PROMPT_TEMPLATE.format(context=context)
+        
         def make_api_call(max_tokens=MAX_TOKENS):
             """Make API call with retry logic."""
             try:
                 response = client.chat.completions.create(
                     model=MODEL_NAME,
                     messages=[
-                        {"role": "system", "content": system_prompt},
+                        {"role": "system", "content": SYSTEM_PROMPT},
                         {"role": "user", "content": user_prompt}
                     ],
                     max_tokens=max_tokens,
@@ -361,10 +367,8 @@ def get_latest_data_timestamp(netuid: int) -> Optional[datetime]:
     """
     try:
         with get_db() as session:
-            latest_metrics = session.query(MetricsSnap).filter_by(netuid=netuid)\
-                .order_by(MetricsSnap.timestamp.desc()).first()
-            
-            return latest_metrics.timestamp if latest_metrics else None
+            return session.query(func.max(MetricsSnap.timestamp))\
+                .filter(MetricsSnap.netuid == netuid).scalar()
             
     except Exception as e:
         logger.error(f"Error getting latest data timestamp for subnet {netuid}: {e}")
@@ -383,18 +387,18 @@ def get_insight_cache_info(netuid: int) -> Dict[str, Any]:
     """
     try:
         with get_db() as session:
-            # Get cached insight
-            cached_insight = session.query(GptInsights).filter_by(netuid=netuid).first()
+            # Get cached insight timestamp (skip loading the insight text)
+            cached_insight = session.query(GptInsights.ts).filter(GptInsights.netuid == netuid).first()
             
-            # Get latest metrics
-            latest_metrics = session.query(MetricsSnap).filter_by(netuid=netuid)\
-                .order_by(MetricsSnap.timestamp.desc()).first()
+            # Get latest metrics timestamp
+            latest_timestamp = session.query(func.max(MetricsSnap.timestamp))\
+                .filter(MetricsSnap.netuid == netuid).scalar()
             
             info = {
                 'netuid': netuid,
                 'has_cached_insight': cached_insight is not None,
                 'cached_insight_timestamp': cached_insight.ts if cached_insight else None,
-                'latest_metrics_timestamp': latest_metrics.timestamp if latest_metrics else None,
+                'latest_metrics_timestamp': latest_timestamp,
                 'cache_is_valid': False,
                 'reason': 'No cached insight'
             }
@@ -402,14 +406,14 @@ def get_insight_cache_info(netuid: int) -> Dict[str, Any]:
             if not cached_insight:
                 return info
             
-            if not latest_metrics or not latest_metrics.timestamp:
+            if not latest_timestamp:
                 # Fallback to TTL check
                 cutoff_time = datetime.utcnow() - timedelta(hours=12)
                 info['cache_is_valid'] = cached_insight.ts >= cutoff_time
                 info['reason'] = 'Using fallback TTL (no metrics data)'
             else:
                 # Data-driven check
-                info['cache_is_valid'] = latest_metrics.timestamp <= cached_insight.ts
+                info['cache_is_valid'] = latest_timestamp <= cached_insight.ts
                 info['reason'] = 'Data-driven cache check'
             
             return info
@@ -465,8 +469,8 @@ def get_buy_signal_from_db(netuid: int) -> Optional[int]:
     """
     try:
         with get_db() as session:
-            # Get the latest metrics snapshot for this subnet
-            latest_snap = session.query(MetricsSnap).filter_by(netuid=netuid)\
+            # Get the buy signal of the latest metrics snapshot for this subnet
+            latest_snap = session.query(MetricsSnap.buy_signal).filter(MetricsSnap.netuid == netuid)\
                 .order_by(MetricsSnap.timestamp.desc()).first()
             
             if latest_snap and latest_snap.buy_signal is not None:
@@ -6,7 +6,7 @@ Generates dynamic cards for the landing page based on correlation analysis data.
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from services.db import get_db, load_screener_frame
 from services.correlation_analysis import correlation_service
 from models import SubnetMeta
@@ -94,7 +94,7 @@ class LandingPageInsightsService:
                 'hot_categories': self._get_hot_categories(df, enrichment_data),
                 'farmer_watchlist': self._get_farmer_watchlist(df),
                 'farmer_redflags': self._get_farmer_redflags(df),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M UTC'),
+                'last_updated': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC'),
                 'data_available': True
             }
             
@@ -606,7 +606,7 @@ class LandingPageInsightsService:
             'outliers': [],
             'price_momentum': [],
             'hot_categories': [],
-            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M UTC'),
+            'last_updated': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC'),
             'data_available': False
         }
 
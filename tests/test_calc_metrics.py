@@ -0,0 +1,98 @@
+"""
+Unit tests for the metric helpers in services.calc_metrics.
+"""
+
+import numpy as np
+import pytest
+from services.calc_metrics import (
+    calculate_active_stake_ratio,
+    calculate_consensus_alignment,
+    calculate_rank_percentage,
+    calculate_stake_hhi,
+    calculate_trust_score,
+    calculate_validator_utilization,
+)
+
+@pytest.fixture(params=[0, 1, 2])
+def metagraph(request):
+    """Heavy-tailed stakes with consensus, trust and permits, as the SDK returns them."""
+    rng = np.random.default_rng(request.param)
+    n = 256
+    return {
+        'stakes': rng.lognormal(mean=8, sigma=3, size=n),
+        'consensus': rng.random(n),
+        'trust': rng.random(n),
+        'permit': rng.random(n) < 0.25,
+    }
+
+class TestFloat32Ingest:
+    """Test the float32 helpers match float64 reference formulas at display precision."""
+
+    def test_stake_hhi(self, metagraph):
+        """Test HHI matches to 1 decimal."""
+        stakes = metagraph['stakes']
+        expected = ((stakes / stakes.sum()) ** 2).sum() * 10000
+
+        assert round(calculate_stake_hhi(stakes), 1) == round(expected, 1)
+
+    def test_consensus_alignment(self, metagraph):
+        """Test consensus alignment matches to 1 decimal."""
+        consensus, stakes = metagraph['consensus'], metagraph['stakes']
+        mean = np.average(consensus, weights=stakes)
+        sigma = np.sqrt(np.average((consensus - mean) ** 2, weights=stakes))
+        aligned = np.abs(consensus - mean) < 2 * sigma
+        expected = np.average(aligned, weights=stakes) * 100
+
+        assert round(calculate_consensus_alignment(consensus, stakes), 1) == round(expected, 1)
+
+    def test_trust_score(self, metagraph):
+        """Test trust score matches to 1 decimal as a percentage."""
+        trust, stakes = metagraph['trust'], metagraph['stakes']
+        expected = (trust * (stakes / stakes.sum())).sum()
+
+        assert round(calculate_trust_score(trust, stakes) * 100, 1) == round(expected * 100, 1)
+
+    def test_trust_score_length_mismatch(self):
+        """Test mismatched trust/stake lengths return None instead of broadcasting."""
+        assert calculate_trust_score(np.array([0.5]), np.array([1.0, 2.0])) is None
+
+    def test_active_stake_ratio(self, metagraph):
+        """Test active stake ratio matches to 1 decimal."""
+        stakes, permit = metagraph['stakes'], metagraph['permit']
+        expected = stakes[permit].sum() / stakes.sum() * 100
+
+        assert calculate_active_stake_ratio(stakes, permit) == round(expected, 1)
+
+
+class TestCalculateValidatorUtilization:
+    """Test validator utilization rounding."""
+
+    def test_halves_round_to_even(self):
+        """Test exact halves round like round(), not half-up."""
+        assert calculate_validator_utilization(32) == 12  # 12.5
+        assert calculate_validator_utilization(96) == 38  # 37.5
+        assert calculate_validator_utilization(160) == 62  # 62.5
+
+    def test_matches_float_round(self):
+        """Test every count matches round() on the float percentage, capped at 100."""
+        for active in range(0, 300):
+            assert calculate_validator_utilization(active) == min(round(active / 256 * 100), 100)
+
+class TestCalculateRankPercentage:
+    """Test rank percentage within a category."""
+
+    def test_position_counts_smaller_values(self):
+        """Test rank equals the share of category values below the value."""
+        assert calculate_rank_percentage(3.0, [4.0, 1.0, None, 3.0, 2.0]) == 50
+        assert calculate_rank_percentage(1.0, [1.0, 1.0, 2.0]) == 0
+
+    def test_value_outside_category_is_ranked(self):
+        """Test a value missing from the category gets the rank it would have."""
+        assert calculate_rank_percentage(5.0, [1.0, 2.0, 3.0]) == 100
+        assert calculate_rank_percentage(0.0, [1.0, 2.0, 3.0]) == 0
+        assert calculate_rank_percentage(2.5, [1.0, 2.0, 3.0]) == 67
+
+    def test_empty_category_returns_none(self):
+        """Test an empty or all-None category has no rank."""
+        assert calculate_rank_percentage(1.0, []) is None
+        assert calculate_rank_percentage(1.0, [None, None]) is None
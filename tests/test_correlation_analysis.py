@@ -0,0 +1,205 @@
+"""
+Unit tests for the correlation analysis service.
+Checks the vectorized statistics against the pandas/scipy reference results.
+"""
+
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from services.correlation_analysis import CorrelationAnalysisService, _pairwise_pearson
+
+class TestPairwisePearson:
+    """Test the masked-matmul Pearson helper."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(200, 6)) * np.logspace(0, 6, 6) + np.logspace(0, 7, 6)
+        values[:, 2] = values[:, 0] * 3 + rng.normal(size=200)
+        values[rng.random(values.shape) < 0.25] = np.nan
+        values[:, 4] = 5.0  # Constant column
+        self.df = pd.DataFrame(values, columns=[f"m{i}" for i in range(6)])
+
+    def test_matches_pandas_pairwise_complete(self):
+        """Test correlations and NaN placement match DataFrame.corr()."""
+        expected = self.df.corr().to_numpy()
+        r, _ = _pairwise_pearson(self.df.to_numpy())
+
+        assert np.array_equal(np.isnan(r), np.isnan(expected))
+        assert np.nanmax(np.abs(r - expected)) < 1e-9
+
+    def test_sample_sizes_count_rows_with_both_values(self):
+        """Test n[i, j] is the number of rows where both metrics are present."""
+        _, n = _pairwise_pearson(self.df.to_numpy())
+
+        assert n[0, 2] == len(self.df[['m0', 'm2']].dropna())
+        assert n[1, 1] == self.df['m1'].notna().sum()
+
+class TestCorrelationMatrix:
+    """Test the correlation matrix built by the service."""
+
+    def test_matches_pandas(self):
+        """Test the service matrix equals pandas on the allowlisted columns."""
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({
+            'netuid': np.arange(50),
+            'tao_score': rng.random(50) * 100,
+            'stake_quality': rng.random(50) * 100,
+            'market_cap_tao': rng.random(50) * 1e6,
+        })
+        df.loc[::7, 'stake_quality'] = np.nan
+
+        corr_matrix = CorrelationAnalysisService()._calculate_correlation_matrix(df)
+        expected = df[['tao_score', 'stake_quality', 'market_cap_tao']].corr()
+
+        assert list(corr_matrix.columns) == list(expected.columns)
+        np.testing.assert_allclose(corr_matrix.to_numpy(), expected.to_numpy(), atol=1e-9)
+
+    def test_coerces_object_columns_and_drops_sparse_metrics(self):
+        """Test object-dtype metrics are coerced and metrics with < 3 values are dropped."""
+        df = pd.DataFrame({
+            'tao_score': [1.0, 2.0, 3.0, 4.0],
+            'stake_quality': ['2', '4', 'n/a', '8'],
+            'emission_roi': [1.0, np.nan, np.nan, 2.0],
+        })
+
+        corr_matrix = CorrelationAnalysisService()._calculate_correlation_matrix(df)
+
+        assert list(corr_matrix.columns) == ['tao_score', 'stake_quality']
+        assert corr_matrix.loc['tao_score', 'stake_quality'] == pytest.approx(1.0)
+
+class TestSignificantCorrelations:
+    """Test the vectorized significance filter."""
+
+    def test_matches_pearsonr(self):
+        """Test r, p-value and sample size match scipy.stats.pearsonr per pair."""
+        rng = np.random.default_rng(2)
+        base = rng.normal(size=40)
+        df = pd.DataFrame({
+            'tao_score': base,
+            'stake_quality': base * 2 + rng.normal(size=40),
+            'market_cap_tao': -base + rng.normal(size=40) * 2,
+            'price_tao': rng.normal(size=40),
+        })
+        df.loc[::5, 'market_cap_tao'] = np.nan
+
+        pairs = CorrelationAnalysisService()._find_significant_correlations(df)
+
+        assert pairs
+        for pair in pairs:
+            valid = df[[pair['metric1'], pair['metric2']]].dropna()
+            corr_coef, p_value = stats.pearsonr(valid[pair['metric1']], valid[pair['metric2']])
+            assert pair['correlation'] == round(corr_coef, 3)
+            assert pair['p_value'] == pytest.approx(round(p_value, 4), abs=1e-4)
+            assert pair['sample_size'] == len(valid)
+
+class TestDetectOutliers:
+    """Test the vectorized outlier detection."""
+
+    def test_flags_extreme_value(self):
+        """Test an extreme value is reported with scipy's z-score and sample std."""
+        values = [10.0] * 9 + [11.0] * 9 + [100.0]
+        df = pd.DataFrame({
+            'netuid': range(19),
+            'subnet_name': [f"subnet {i}" for i in range(19)],
+            'tao_score': values,
+            'active_validators': [5.0] * 19,  # Constant, never an outlier
+        })
+
+        outliers = CorrelationAnalysisService()._detect_outliers(df)
+
+        assert len(outliers) == 1
+        assert outliers[0]['netuid'] == 18
+        assert outliers[0]['metric'] == 'tao_score'
+        assert outliers[0]['z_score'] == round(float(stats.zscore(values)[-1]), 2)
+        assert outliers[0]['std'] == round(float(pd.Series(values).std()), 2)
+
+class TestSummaryStats:
+    """Test the one-pass summary statistics."""
+
+    def test_all_nan_metric_is_skipped(self):
+        """Test an all-NaN metric is left out without an empty-slice warning."""
+        df = pd.DataFrame({
+            'netuid': range(5),
+            'timestamp': pd.Timestamp('2025-01-01'),
+            'tao_score': [1.0, 2.0, 3.0, 4.0, 5.0],
+            'stake_quality': [np.nan] * 5,
+        })
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', RuntimeWarning)
+            summary = CorrelationAnalysisService()._calculate_summary_stats(df)
+
+        assert summary['tao_score']['mean'] == 3.0
+        assert summary['tao_score']['count'] == 5
+        assert 'stake_quality' not in summary
+
+class TestAnalysisCache:
+    """Test caching of analysis results per snapshot."""
+
+    def setup_method(self):
+        rng = np.random.default_rng(3)
+        self.df = pd.DataFrame({
+            'netuid': np.arange(30),
+            'timestamp': pd.Timestamp('2025-01-01'),
+            'tao_score': rng.random(30),
+            'stake_quality': rng.random(30),
+        })
+        self.service = CorrelationAnalysisService()
+        self.latest = '2025-01-01 00:00:00'
+        self.loads = 0
+
+        def get_analysis_data(days_back, selected_subnet=None):
+            self.loads += 1
+            return self.df
+
+        self.service._get_analysis_data = get_analysis_data
+        self.service._probe_snapshot = lambda days_back, selected_subnet=None: (self.latest, self.row_count)
+        self.row_count = 30
+
+    def test_same_snapshot_is_served_from_cache(self):
+        """Test repeated calls for an unchanged snapshot load the data once."""
+        first = self.service.get_correlation_analysis(2)
+        second = self.service.get_correlation_analysis(2, 'all')
+
+        assert first['success'] and second['success']
+        assert self.loads == 1
+
+    def test_new_snapshot_or_clear_recomputes(self):
+        """Test a newer snapshot or clear_cache() triggers a fresh analysis."""
+        self.service.get_correlation_analysis(2)
+        self.latest = '2025-01-01 00:10:00'
+        self.service.get_correlation_analysis(2)
+        assert self.service.clear_cache()
+        self.service.get_correlation_analysis(2)
+
+        assert self.loads == 3
+
+    def test_rows_leaving_window_recompute(self):
+        """Test rows ageing out of the window invalidate the cached result."""
+        self.service.get_correlation_analysis(2)
+        self.row_count = 25
+        self.service.get_correlation_analysis(2)
+
+        assert self.loads == 2
+
+    def test_cached_result_is_not_shared(self):
+        """Test callers mutating a result don't change the cached copy."""
+        first = self.service.get_correlation_analysis(2)
+        first['correlation_matrix'].iloc[0, 0] = 99.0
+        first['significant_correlations'].clear()
+
+        second = self.service.get_correlation_analysis(2)
+
+        assert second['correlation_matrix'].iloc[0, 0] != 99.0
+        assert second['significant_correlations'] is not first['significant_correlations']
+
+    def test_sparse_window_short_circuits(self):
+        """Test a window with too few snapshots returns without loading data."""
+        self.row_count = 4
+
+        result = self.service.get_correlation_analysis(2, '5')
+
+        assert not result['success']
+        assert self.loads == 0